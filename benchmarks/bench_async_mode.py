@@ -0,0 +1,131 @@
+"""Requests per second and p99 latency of GET /todos/: sync vs async mode.
+
+Drives the app in-process through httpx's ASGI transport with 500
+concurrent clients against a temporary SQLite file. Run from the
+project root with ``PYTHONPATH=src python benchmarks/bench_async_mode.py``.
+"""
+
+import asyncio
+import inspect
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from fast_zero.app import create_app
+from fast_zero.database import get_async_session, get_session
+from fast_zero.models import Todo, TodoState, User, table_registry
+from fast_zero.security import create_access_token
+
+CONCURRENCY = 500
+REQUESTS = 2_000
+TODOS = 100
+
+
+def seed(database_url):
+    engine = create_engine(database_url)
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        user = User(
+            username="bench",
+            email="bench@example.com",
+            password="unused",
+        )
+        session.add(user)
+        session.flush()
+        session.add_all(
+            Todo(
+                title=f"todo {n}",
+                description="benchmark todo",
+                state=TodoState.todo,
+                user_id=user.id,
+            )
+            for n in range(TODOS)
+        )
+        session.commit()
+
+    engine.dispose()
+    return create_access_token({"sub": "bench@example.com"})
+
+
+def sync_app(database_url):
+    engine = create_engine(
+        database_url,
+        pool_size=CONCURRENCY,
+        max_overflow=0,
+    )
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app = create_app(async_mode=False)
+    app.dependency_overrides[get_session] = session_override
+    app.state.engine = engine
+    return app
+
+
+def async_app(database_url):
+    engine = create_async_engine(
+        database_url.replace("sqlite", "sqlite+aiosqlite", 1),
+        pool_size=CONCURRENCY,
+        max_overflow=0,
+    )
+
+    async def session_override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = create_app(async_mode=True)
+    app.dependency_overrides[get_async_session] = session_override
+    app.state.engine = engine
+    return app
+
+
+async def drive(app, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    remaining = iter(range(REQUESTS))
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+    ) as client:
+
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                await client.get("/todos/?limit=20", headers=headers)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - start
+
+    disposed = app.state.engine.dispose()
+    if inspect.isawaitable(disposed):
+        await disposed
+
+    p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+    return REQUESTS / elapsed, p99
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        token = seed(database_url)
+
+        print(f"{CONCURRENCY} concurrent clients, {REQUESTS} requests")
+        for label, factory in (("sync", sync_app), ("async", async_app)):
+            rps, p99 = asyncio.run(drive(factory(database_url), token))
+            print(f"{label:>6}: {rps:8.0f} req/s  p99 {p99:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
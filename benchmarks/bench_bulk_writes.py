@@ -0,0 +1,113 @@
+"""Writing N todos one request at a time vs through the bulk endpoints.
+
+Creates, updates and deletes N todos (5k by default) against a
+temporary SQLite file, first with one request per todo and then with a
+single POST/PATCH/DELETE on /todos/bulk. Run from the project root with
+``PYTHONPATH=src python benchmarks/bench_bulk_writes.py [N]``.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from fast_zero.app import create_app
+from fast_zero.database import get_session
+from fast_zero.models import User, table_registry
+from fast_zero.security import create_access_token
+
+
+def build_client(database_url):
+    engine = create_engine(database_url)
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add(
+            User(username="bench", email="bench@example.com", password="x")
+        )
+        session.commit()
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app = create_app()
+    app.dependency_overrides[get_session] = session_override
+    token = create_access_token({"sub": "bench@example.com"})
+    client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+    return client, engine
+
+
+def todo(n):
+    return {"title": f"todo {n}", "description": "bench", "state": "todo"}
+
+
+def one_by_one(client, total):
+    ids = [
+        client.post("/todos/", json=todo(n)).json()["id"] for n in range(total)
+    ]
+    yield
+
+    for todo_id in ids:
+        client.put(f"/todos/{todo_id}", json={**todo(0), "state": "done"})
+    yield
+
+    for todo_id in ids:
+        client.delete(f"/todos/{todo_id}")
+    yield
+
+
+def bulk(client, total):
+    response = client.post(
+        "/todos/bulk",
+        json={"todos": [todo(n) for n in range(total)]},
+    )
+    ids = [item["id"] for item in response.json()["todos"]]
+    yield
+
+    client.patch(
+        "/todos/bulk",
+        json={"todos": [{"id": todo_id, "state": "done"} for todo_id in ids]},
+    )
+    yield
+
+    client.request("DELETE", "/todos/bulk", json={"ids": ids})
+    yield
+
+
+def timed_steps(steps):
+    timings = []
+    start = time.perf_counter()
+
+    for _ in steps:
+        timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+
+    return timings
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+    print(f"{total} todos")
+    print("           create s   update s   delete s")
+    for label, use_bulk in (("one by one", False), ("bulk", True)):
+        with tempfile.TemporaryDirectory() as directory:
+            client, engine = build_client(
+                f"sqlite:///{Path(directory) / 'bench.db'}"
+            )
+            create, update, delete = timed_steps(
+                (bulk if use_bulk else one_by_one)(client, total)
+            )
+            client.close()
+            engine.dispose()
+
+        print(f"{label:>10} {create:10.2f} {update:10.2f} {delete:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Memory and fan-out latency of N idle long-polls on GET /todos/changes.
+
+Parks N concurrent long-poll requests (10k by default) from one user
+in-process through httpx's ASGI transport, in sync and async mode, then
+publishes a single change and times how long it takes for every poll to
+return. RSS growth (Linux only) includes the client side of each
+request. Run from the project root with ``PYTHONPATH=src python
+benchmarks/bench_change_feed.py [N]``.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import httpx
+from sqlalchemy import NullPool, create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from fast_zero.app import create_app
+from fast_zero.database import get_async_session, get_session
+from fast_zero.events import broker
+from fast_zero.models import User, table_registry
+from fast_zero.security import create_access_token
+
+
+def rss_mb() -> float:
+    # Linux only: resident pages are the second field of statm.
+    pages = int(
+        Path("/proc/self/statm").read_text(encoding="ascii").split()[1]
+    )
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def seed(database_url):
+    engine = create_engine(database_url)
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add(
+            User(username="bench", email="bench@example.com", password="x")
+        )
+        session.commit()
+
+    engine.dispose()
+    token = create_access_token({"sub": "bench@example.com"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def sync_app(database_url):
+    engine = create_engine(database_url)
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app = create_app(async_mode=False)
+    app.dependency_overrides[get_session] = session_override
+    return app
+
+
+def async_app(database_url):
+    engine = create_async_engine(
+        database_url.replace("sqlite", "sqlite+aiosqlite", 1),
+        poolclass=NullPool,
+    )
+
+    async def session_override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = create_app(async_mode=True)
+    app.dependency_overrides[get_async_session] = session_override
+    return app
+
+
+async def drive(app, headers, total):
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+        timeout=None,
+    ) as client:
+        await client.get("/todos/?limit=1", headers=headers)
+        before = rss_mb()
+
+        polls = [
+            asyncio.create_task(client.get("/todos/changes", headers=headers))
+            for _ in range(total)
+        ]
+        while broker.subscriber_count() < total:
+            await asyncio.sleep(0.05)
+
+        parked = rss_mb()
+        start = time.perf_counter()
+        broker.publish(1, "deleted", {"ids": [0]})
+        responses = await asyncio.gather(*polls)
+        elapsed = time.perf_counter() - start
+
+    woken = sum(bool(response.json()["events"]) for response in responses)
+    return parked - before, elapsed, woken
+
+
+def run(async_mode, total):
+    factory = async_app if async_mode else sync_app
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        headers = seed(database_url)
+        return asyncio.run(drive(factory(database_url), headers, total))
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    print(f"{total} parked long-polls")
+    print("          RSS growth   per poll    fan-out   woken")
+    for label, async_mode in (("sync", False), ("async", True)):
+        # A fresh process per mode keeps the RSS readings independent.
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+            grown, elapsed, woken = pool.submit(
+                run, async_mode, total
+            ).result()
+
+        print(
+            f"{label:>6} {grown:10.1f} MB {grown * 1024 / total:7.1f} KB "
+            f"{elapsed:8.2f} s {woken:7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
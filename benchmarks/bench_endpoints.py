@@ -0,0 +1,556 @@
+"""Throughput and p50/p95/p99 latency of every endpoint under load.
+
+Seeds a temporary SQLite file with users and todos built by the test
+factories, then drives the app in-process through httpx's ASGI
+transport with --concurrency concurrent clients, so nothing leaves the
+machine. Every endpoint gets --requests timed requests after a short
+warm-up, and the results go to a JSON report that --compare diffs
+against a report from another commit.
+
+Pass --database-url (and --async-database-url with --async-mode) to
+run against a local PostgreSQL instead; its tables are dropped and
+recreated. Every request comes from one client address, so the login
+admission limits are lifted unless --login-limits is given. Run from
+the project root with ``PYTHONPATH=src:. python
+benchmarks/bench_endpoints.py [--output report.json]``.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http import HTTPStatus
+from pathlib import Path
+
+import factory.random
+import httpx
+import sqlalchemy
+from sqlalchemy import make_url, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from fast_zero.app import create_app
+from fast_zero.database import (
+    build_async_engine,
+    build_engine,
+    get_async_session,
+    get_session,
+)
+from fast_zero.models import Todo, User, table_registry
+from fast_zero.routers.auth import admit_login
+from fast_zero.security import create_access_token, get_password_hash
+from tests.conftest import TodoFactory, UserFactory
+
+PASSWORD = "benchmark-password"
+WARMUP = 10
+BULK_SIZE = 10
+BULK_DELETE_SIZE = 5
+
+
+@dataclass
+class SeededUser:
+    id: int
+    username: str
+    email: str
+    headers: dict
+    todo_ids: list[int]
+
+
+@dataclass
+class Seed:
+    users: list[SeededUser]
+    spare_users: list[SeededUser]
+    search_term: str
+    signups: int = 0
+
+    def user(self, index: int) -> SeededUser:
+        return self.users[index % len(self.users)]
+
+    # Deletes consume todos from the end of each user's list, so the ones
+    # at the front stay available to the update scenarios.
+    def take_todos(self, index: int, count: int) -> list[int]:
+        todo_ids = self.user(index).todo_ids
+        taken = todo_ids[-count:]
+        del todo_ids[-count:]
+        return taken
+
+
+def todo_payload(n: int) -> dict:
+    return {"title": f"load {n}", "description": "load test", "state": "todo"}
+
+
+def read_root(seed, index):
+    return "GET", "/", {}
+
+
+def login(seed, index):
+    user = seed.user(index)
+    credentials = {"username": user.email, "password": PASSWORD}
+    return "POST", "/auth/token", {"data": credentials}
+
+
+def refresh_token(seed, index):
+    return "GET", "/auth/refresh_token", {"headers": seed.user(index).headers}
+
+
+def create_user(seed, index):
+    seed.signups += 1
+    username = f"signup{seed.signups}"
+    payload = {
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": PASSWORD,
+    }
+    return "POST", "/users/", {"json": payload}
+
+
+def list_users(seed, index):
+    return "GET", "/users/", {"params": {"limit": 100}}
+
+
+def update_user(seed, index):
+    user = seed.user(index)
+    payload = {
+        "username": user.username,
+        "email": user.email,
+        "password": PASSWORD,
+    }
+    return (
+        "PUT",
+        f"/users/{user.id}",
+        {"json": payload, "headers": user.headers},
+    )
+
+
+def delete_user(seed, index):
+    user = seed.spare_users.pop()
+    return "DELETE", f"/users/{user.id}", {"headers": user.headers}
+
+
+def create_todo(seed, index):
+    options = {
+        "json": todo_payload(index),
+        "headers": seed.user(index).headers,
+    }
+    return "POST", "/todos/", options
+
+
+def list_todos(seed, index):
+    return "GET", "/todos/", {"headers": seed.user(index).headers}
+
+
+def search_todos(seed, index):
+    options = {
+        "params": {"search": seed.search_term},
+        "headers": seed.user(index).headers,
+    }
+    return "GET", "/todos/", options
+
+
+def todo_stats(seed, index):
+    return "GET", "/todos/stats", {"headers": seed.user(index).headers}
+
+
+# Runs after the write scenarios, which published an event for every user
+# this index maps to, so since=0 answers at once instead of long-polling.
+def todo_changes(seed, index):
+    options = {"params": {"since": 0}, "headers": seed.user(index).headers}
+    return "GET", "/todos/changes", options
+
+
+def export_todos(seed, index):
+    return "GET", "/todos/export", {"headers": seed.user(index).headers}
+
+
+def import_todos(seed, index):
+    lines = (json.dumps(todo_payload(n)) for n in range(BULK_SIZE))
+    upload = ("todos.ndjson", "\n".join(lines).encode())
+    options = {"files": {"file": upload}, "headers": seed.user(index).headers}
+    return "POST", "/todos/import", options
+
+
+def create_todos_bulk(seed, index):
+    payload = {"todos": [todo_payload(n) for n in range(BULK_SIZE)]}
+    options = {"json": payload, "headers": seed.user(index).headers}
+    return "POST", "/todos/bulk", options
+
+
+def update_todos_bulk(seed, index):
+    user = seed.user(index)
+    payload = {
+        "todos": [
+            {"id": todo_id, "state": "doing"}
+            for todo_id in user.todo_ids[:BULK_SIZE]
+        ],
+    }
+    return "PATCH", "/todos/bulk", {"json": payload, "headers": user.headers}
+
+
+def delete_todos_bulk(seed, index):
+    payload = {"ids": seed.take_todos(index, BULK_DELETE_SIZE)}
+    options = {"json": payload, "headers": seed.user(index).headers}
+    return "DELETE", "/todos/bulk", options
+
+
+def update_todo(seed, index):
+    user = seed.user(index)
+    options = {"json": todo_payload(index), "headers": user.headers}
+    return "PUT", f"/todos/{user.todo_ids[0]}", options
+
+
+def patch_todo(seed, index):
+    user = seed.user(index)
+    options = {"json": {"state": "done"}, "headers": user.headers}
+    return "PATCH", f"/todos/{user.todo_ids[0]}", options
+
+
+def delete_todo(seed, index):
+    (todo_id,) = seed.take_todos(index, 1)
+    options = {"headers": seed.user(index).headers}
+    return "DELETE", f"/todos/{todo_id}", options
+
+
+def read_metrics(seed, index):
+    return "GET", "/metrics", {}
+
+
+# Read-only scenarios first, destructive ones last.
+SCENARIOS = [
+    ("GET /", read_root),
+    ("POST /auth/token", login),
+    ("GET /auth/refresh_token", refresh_token),
+    ("GET /users/", list_users),
+    ("GET /todos/", list_todos),
+    ("GET /todos/?search", search_todos),
+    ("GET /todos/stats", todo_stats),
+    ("GET /todos/export", export_todos),
+    ("POST /users/", create_user),
+    ("PUT /users/{user_id}", update_user),
+    ("POST /todos/", create_todo),
+    ("GET /todos/changes", todo_changes),
+    ("POST /todos/import", import_todos),
+    ("POST /todos/bulk", create_todos_bulk),
+    ("PATCH /todos/bulk", update_todos_bulk),
+    ("PUT /todos/{todo_id}", update_todo),
+    ("PATCH /todos/{todo_id}", patch_todo),
+    ("DELETE /todos/bulk", delete_todos_bulk),
+    ("DELETE /todos/{todo_id}", delete_todo),
+    ("DELETE /users/{user_id}", delete_user),
+    ("GET /metrics", read_metrics),
+]
+
+
+def seeded_user(user: User, todo_ids: list[int]) -> SeededUser:
+    token = create_access_token({"sub": user.email})
+    return SeededUser(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        headers={"Authorization": f"Bearer {token}"},
+        todo_ids=todo_ids,
+    )
+
+
+def seed_database(engine, users: int, todos: int, spare_users: int) -> Seed:
+    table_registry.metadata.drop_all(engine)
+    table_registry.metadata.create_all(engine)
+    password_hash = get_password_hash(PASSWORD)
+
+    with Session(engine) as session:
+        db_users = UserFactory.create_batch(
+            users + spare_users,
+            password=password_hash,
+        )
+        session.add_all(db_users)
+        session.flush()
+
+        for db_user in db_users[:users]:
+            session.add_all(
+                TodoFactory.create_batch(todos, user_id=db_user.id)
+            )
+
+        session.commit()
+        todo_ids = {db_user.id: [] for db_user in db_users}
+
+        for todo_id, user_id in session.execute(
+            select(Todo.id, Todo.user_id).order_by(Todo.id),
+        ):
+            todo_ids[user_id].append(todo_id)
+
+        title = session.scalar(select(Todo.title).limit(1)) or "load"
+        return Seed(
+            users=[
+                seeded_user(db_user, todo_ids[db_user.id])
+                for db_user in db_users[:users]
+            ],
+            spare_users=[
+                seeded_user(db_user, []) for db_user in db_users[users:]
+            ],
+            search_term=title.split()[0].strip(".,"),
+        )
+
+
+def percentile(latencies: list[float], percent: int) -> float:
+    if len(latencies) == 1:
+        return latencies[0]
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return quantiles[percent - 1]
+
+
+def summarize(latencies: list[float], statuses: Counter, elapsed: float):
+    return {
+        "requests": len(latencies),
+        "errors": sum(
+            count
+            for status, count in statuses.items()
+            if status >= HTTPStatus.BAD_REQUEST
+        ),
+        "statuses": {str(status): statuses[status] for status in statuses},
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def run_scenario(client, seed, build, indexes: range, concurrency):
+    latencies = []
+    statuses = Counter()
+    remaining = iter(indexes)
+
+    async def worker():
+        for index in remaining:
+            method, url, options = build(seed, index)
+            request_start = time.perf_counter()
+            response = await client.request(method, url, **options)
+            latencies.append(time.perf_counter() - request_start)
+            statuses[response.status_code] += 1
+
+    scenario_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - scenario_start)
+
+
+async def run_load(app, seed, requests: int, concurrency: int) -> dict:
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+    ) as client:
+        for name, build in SCENARIOS:
+            await run_scenario(
+                client,
+                seed,
+                build,
+                range(WARMUP),
+                concurrency,
+            )
+            results[name] = await run_scenario(
+                client,
+                seed,
+                build,
+                range(WARMUP, WARMUP + requests),
+                concurrency,
+            )
+            print(format_result(name, results[name]), flush=True)
+
+    return results
+
+
+def format_result(name: str, result: dict) -> str:
+    return (
+        f"{name:<26} {result['throughput_rps']:>9.1f} req/s"
+        f"  p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}"
+        f"  p99 {result['p99_ms']:>8.2f} ms  errors {result['errors']}"
+    )
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return result.stdout.strip()
+
+
+def async_url(database_url: str, async_database_url: str | None) -> str:
+    if async_database_url:
+        return async_database_url
+
+    url = make_url(database_url)
+
+    if url.get_backend_name() != "sqlite":
+        raise SystemExit("--async-database-url is needed for this database")
+
+    return url.set(drivername="sqlite+aiosqlite").render_as_string(
+        hide_password=False,
+    )
+
+
+def admit_every_login():
+    yield
+
+
+def build_app(args, database_url: str):
+    app = create_app(async_mode=args.async_mode)
+
+    if not args.login_limits:
+        app.dependency_overrides[admit_login] = admit_every_login
+
+    if args.async_mode:
+        async_engine = build_async_engine(
+            async_url(database_url, args.async_database_url),
+        )
+
+        async def async_session_override():
+            async with AsyncSession(
+                async_engine,
+                expire_on_commit=False,
+            ) as session:
+                yield session
+
+        app.dependency_overrides[get_async_session] = async_session_override
+        return app, async_engine
+
+    engine = build_engine(database_url)
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session_override
+    return app, engine
+
+
+def run(args, database_url: str) -> dict:
+    factory.random.reseed_random(args.seed)
+    seed_engine = build_engine(database_url)
+    seed = seed_database(
+        seed_engine,
+        args.users,
+        args.todos,
+        spare_users=args.requests + WARMUP,
+    )
+    seed_engine.dispose()
+
+    app, engine = build_app(args, database_url)
+
+    try:
+        results = asyncio.run(
+            run_load(app, seed, args.requests, args.concurrency),
+        )
+    finally:
+        if args.async_mode:
+            asyncio.run(engine.dispose())
+        else:
+            engine.dispose()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "database": make_url(database_url).get_backend_name(),
+            "async_mode": args.async_mode,
+            "login_limits": args.login_limits,
+            "users": args.users,
+            "todos_per_user": args.todos,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "endpoints": results,
+    }
+
+
+def change(old: float, new: float) -> str:
+    if not old:
+        return "     n/a"
+
+    return f"{(new - old) / old:+8.1%}"
+
+
+def compare(baseline: dict, report: dict):
+    print(f"\nagainst {baseline['meta'].get('commit') or 'baseline'}")
+    print(
+        f"{'endpoint':<26} {'req/s':>9} {'change':>8}"
+        f" {'p95 ms':>9} {'change':>8}"
+    )
+
+    for name, result in report["endpoints"].items():
+        old = baseline["endpoints"].get(name)
+
+        if old is None:
+            continue
+
+        print(
+            f"{name:<26} {result['throughput_rps']:>9.1f}"
+            f" {change(old['throughput_rps'], result['throughput_rps'])}"
+            f" {result['p95_ms']:>9.2f}"
+            f" {change(old['p95_ms'], result['p95_ms'])}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--todos", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--async-mode", action="store_true")
+    parser.add_argument("--login-limits", action="store_true")
+    parser.add_argument("--database-url")
+    parser.add_argument("--async-database-url")
+    parser.add_argument("--output", type=Path, default=Path("bench.json"))
+    parser.add_argument("--compare", type=Path)
+    args = parser.parse_args(argv)
+
+    # Each user loses todos to DELETE /todos/bulk and DELETE /todos/{id}
+    # and keeps BULK_SIZE for the update scenarios.
+    rounds = -(-(args.requests + WARMUP) // args.users)
+    needed = rounds * (BULK_DELETE_SIZE + 1) + BULK_SIZE
+
+    if args.todos < needed:
+        parser.error(f"--todos must be at least {needed} for this load")
+
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = (
+            args.database_url or f"sqlite:///{Path(directory) / 'bench.db'}"
+        )
+        report = run(args, database_url)
+
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"report written to {args.output}")
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
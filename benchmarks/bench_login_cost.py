@@ -0,0 +1,86 @@
+"""Login p50/p99 latency for each Argon2 cost parameter set.
+
+Run from the project root with ``PYTHONPATH=src python
+benchmarks/bench_login_cost.py``.
+"""
+
+import os
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import StaticPool, create_engine
+from sqlalchemy.orm import Session
+
+from fast_zero.app import app
+from fast_zero.database import get_session
+from fast_zero.models import User, table_registry
+from fast_zero.security import get_password_hash
+from fast_zero.settings import reload_settings
+
+LOGINS = 50
+PARAMETER_SETS = [
+    # (time_cost, memory_cost in KiB, parallelism)
+    (1, 19_456, 1),
+    (2, 19_456, 1),
+    (3, 65_536, 4),
+    (4, 131_072, 4),
+]
+
+
+def percentile(samples, pct):
+    return statistics.quantiles(samples, n=100)[pct - 1]
+
+
+def measure(client, session, time_cost, memory_cost, parallelism):
+    os.environ["ARGON2_TIME_COST"] = str(time_cost)
+    os.environ["ARGON2_MEMORY_COST"] = str(memory_cost)
+    os.environ["ARGON2_PARALLELISM"] = str(parallelism)
+    reload_settings()
+
+    email = f"bench-{time_cost}-{memory_cost}-{parallelism}@example.com"
+    session.add(
+        User(
+            username=email,
+            email=email,
+            password=get_password_hash("password"),
+        )
+    )
+    session.commit()
+
+    samples = []
+    for _ in range(LOGINS):
+        start = time.perf_counter()
+        client.post(
+            "/auth/token",
+            data={"username": email, "password": "password"},
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return percentile(samples, 50), percentile(samples, 99)
+
+
+def main():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session, TestClient(app) as client:
+        app.dependency_overrides[get_session] = lambda: session
+
+        print("time_cost memory_cost parallelism   p50 ms   p99 ms")
+        for params in PARAMETER_SETS:
+            p50, p99 = measure(client, session, *params)
+            print(
+                f"{params[0]:>9} {params[1]:>11} {params[2]:>11}"
+                f" {p50:>8.1f} {p99:>8.1f}"
+            )
+
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
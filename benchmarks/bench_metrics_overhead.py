@@ -0,0 +1,102 @@
+"""Per-request and per-statement cost of the metrics instrumentation.
+
+Drives a minimal ASGI app directly, without a server or HTTP client, so
+the only difference between the two runs is MetricsMiddleware. The
+statement hooks are timed the same way on an in-memory SQLite engine.
+Each figure is the best of several interleaved rounds, which keeps
+scheduler noise out of a difference of a few microseconds.
+Run from the project root with ``PYTHONPATH=src python
+benchmarks/bench_metrics_overhead.py``.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+
+from fast_zero.database import instrument_statements
+from fast_zero.middleware import MetricsMiddleware
+
+REQUESTS = 50_000
+STATEMENTS = 20_000
+ROUNDS = 7
+ROUTE = SimpleNamespace(path="/todos/{todo_id}")
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b"{}"}
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = ROUTE
+    await send(START)
+    await send(BODY)
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def drive(app) -> float:
+    start = time.perf_counter()
+
+    for _ in range(REQUESTS):
+        await app({"type": "http", "method": "GET"}, receive, send)
+
+    return (time.perf_counter() - start) / REQUESTS * 1_000_000
+
+
+def execute(connection) -> float:
+    start = time.perf_counter()
+
+    for _ in range(STATEMENTS):
+        connection.exec_driver_sql("SELECT 1")
+
+    return (time.perf_counter() - start) / STATEMENTS * 1_000_000
+
+
+def best_of(*functions) -> list[float]:
+    timings = [[] for _ in functions]
+
+    for _ in range(ROUNDS):
+        for timing, function in zip(timings, functions):
+            timing.append(function())
+
+    return [min(timing) for timing in timings]
+
+
+def main():
+    middleware = MetricsMiddleware(endpoint)
+    bare, measured = best_of(
+        lambda: asyncio.run(drive(endpoint)),
+        lambda: asyncio.run(drive(middleware)),
+    )
+    print(f"{REQUESTS} requests through a no-op ASGI app")
+    print(f"  without middleware  {bare:8.2f} us/request")
+    print(f"  with middleware     {measured:8.2f} us/request")
+    print(f"  overhead            {measured - bare:8.2f} us/request")
+
+    plain_engine = create_engine("sqlite://")
+    hooked_engine = create_engine("sqlite://")
+    instrument_statements(hooked_engine)
+
+    with (
+        plain_engine.connect() as plain_connection,
+        hooked_engine.connect() as hooked_connection,
+    ):
+        plain, hooked = best_of(
+            lambda: execute(plain_connection),
+            lambda: execute(hooked_connection),
+        )
+
+    print(f"{STATEMENTS} SELECT 1 statements on in-memory SQLite")
+    print(f"  without hooks       {plain:8.2f} us/statement")
+    print(f"  with hooks          {hooked:8.2f} us/statement")
+    print(f"  overhead            {hooked - plain:8.2f} us/statement")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Page latency by depth: OFFSET pagination vs keyset cursors.
+
+Seeds a temporary SQLite file with one user owning N todos (1M by
+default) and times list_todos_query() at increasing depths. Run from
+the project root with ``PYTHONPATH=src python
+benchmarks/bench_pagination.py [N]``.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from fast_zero.models import Todo, User, table_registry
+from fast_zero.pagination import encode_cursor
+from fast_zero.routers.todos import list_todos_query
+from fast_zero.schemas import FilterTodo
+
+PAGE_SIZE = 100
+BATCH_SIZE = 50_000
+REPEAT = 5
+
+
+def seed(session, total):
+    user = User(username="bench", email="bench@example.com", password="x")
+    session.add(user)
+    session.flush()
+
+    for start in range(0, total, BATCH_SIZE):
+        session.execute(
+            insert(Todo),
+            [
+                {
+                    "title": f"todo {n}",
+                    "description": "benchmark todo",
+                    "state": "todo",
+                    "user_id": user.id,
+                }
+                for n in range(start, min(start + BATCH_SIZE, total))
+            ],
+        )
+
+    session.commit()
+    return user.id
+
+
+def timed(session, query):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        session.scalars(query).all()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        table_registry.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            user_id = seed(session, total)
+
+            print(f"{total} todos, pages of {PAGE_SIZE}")
+            print("     depth   offset ms   cursor ms")
+            for fraction in (0, 0.01, 0.1, 0.5, 0.9, 0.99):
+                depth = int(total * fraction)
+                by_offset = FilterTodo(offset=depth, limit=PAGE_SIZE)
+                by_cursor = FilterTodo(
+                    cursor=encode_cursor(user_id, depth),
+                    limit=PAGE_SIZE,
+                )
+                offset_ms = timed(
+                    session, list_todos_query(user_id, by_offset, "sqlite")
+                )
+                cursor_ms = timed(
+                    session, list_todos_query(user_id, by_cursor, "sqlite")
+                )
+                print(f"{depth:>10} {offset_ms:>11.2f} {cursor_ms:>11.2f}")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Tokens issued and verified per second: Settings() vs get_settings().
+
+Run from the project root with ``PYTHONPATH=src python
+benchmarks/bench_settings.py``.
+"""
+
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from jwt import decode, encode
+
+from fast_zero.settings import Settings, get_settings
+
+ITERATIONS = 2_000
+
+
+def issue_and_verify(settings_factory):
+    settings = settings_factory()
+    expire = datetime.now(tz=ZoneInfo("UTC")) + timedelta(
+        minutes=settings_factory().ACCESS_TOKEN_EXPIRE_MINUTES,
+    )
+    token = encode(
+        {"sub": "bench@example.com", "exp": expire},
+        settings_factory().SECRET_KEY,
+        algorithm=settings_factory().ALGORITHM,
+    )
+    decode(
+        token,
+        settings.SECRET_KEY,
+        algorithms=[settings_factory().ALGORITHM],
+    )
+
+
+def run(label, settings_factory):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        issue_and_verify(settings_factory)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>16}: {ITERATIONS / elapsed:10.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    run("Settings()", Settings)
+    run("get_settings()", get_settings)
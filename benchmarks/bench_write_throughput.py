@@ -0,0 +1,113 @@
+"""Write throughput and SQL statements per request for todo/user writes.
+
+Sends N todo creates, N todo updates and N user creates (2k by default)
+against a temporary SQLite file and reports requests per second and
+the number of SQL statements each request executed. Argon2 runs at its
+cheapest setting so password hashing does not hide database costs. Run
+from the project root with ``PYTHONPATH=src python
+benchmarks/bench_write_throughput.py [N]``.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.update(
+    ARGON2_TIME_COST="1",
+    ARGON2_MEMORY_COST="8",
+    ARGON2_PARALLELISM="1",
+)
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from fast_zero.app import create_app
+from fast_zero.database import build_engine, get_session
+from fast_zero.models import User, table_registry
+from fast_zero.security import create_access_token
+
+
+def todo(n, state="todo"):
+    return {"title": f"todo {n}", "description": "bench", "state": state}
+
+
+def user(n):
+    return {
+        "username": f"user{n}",
+        "email": f"user{n}@example.com",
+        "password": "secret",
+    }
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        table_registry.metadata.create_all(engine)
+        statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        with Session(engine) as session:
+            session.add(
+                User(username="bench", email="bench@example.com", password="x")
+            )
+            session.commit()
+
+        def session_override():
+            with Session(engine) as session:
+                yield session
+
+        app = create_app()
+        app.dependency_overrides[get_session] = session_override
+        token = create_access_token({"sub": "bench@example.com"})
+        client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+        # Warm the authenticated-user cache so it does not count below.
+        client.get("/todos/?limit=1")
+
+        todo_ids = []
+        requests = (
+            (
+                "POST /todos/",
+                lambda n: todo_ids.append(
+                    client.post("/todos/", json=todo(n)).json()["id"]
+                ),
+            ),
+            (
+                "PUT /todos/{id}",
+                lambda n: client.put(
+                    f"/todos/{todo_ids[n]}", json=todo(n, "done")
+                ),
+            ),
+            (
+                "POST /users/",
+                lambda n: client.post("/users/", json=user(n)),
+            ),
+        )
+
+        print(f"{total} requests each")
+        print("                       req/s   statements/request")
+        for label, send in requests:
+            statements.clear()
+            start = time.perf_counter()
+            for n in range(total):
+                send(n)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label:>18} {total / elapsed:9.0f} "
+                f"{len(statements) / total:20.1f}"
+            )
+
+        client.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
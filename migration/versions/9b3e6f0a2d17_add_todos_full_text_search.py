@@ -0,0 +1,76 @@
+"""add todos full text search
+
+Revision ID: 9b3e6f0a2d17
+Revises: 5c2f1d9b7e41
+Create Date: 2026-10-18 14:03:27.518940
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3e6f0a2d17"
+down_revision: Union[str, None] = "5c2f1d9b7e41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE todos_fts USING fts5("
+            "title, description, content='todos', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute("INSERT INTO todos_fts (todos_fts) VALUES ('rebuild')")
+        op.execute(
+            "CREATE TRIGGER todos_fts_ai AFTER INSERT ON todos BEGIN "
+            "INSERT INTO todos_fts (rowid, title, description) "
+            "VALUES (new.id, new.title, new.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER todos_fts_ad AFTER DELETE ON todos BEGIN "
+            "INSERT INTO todos_fts (todos_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER todos_fts_au "
+            "AFTER UPDATE OF title, description ON todos BEGIN "
+            "INSERT INTO todos_fts (todos_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "INSERT INTO todos_fts (rowid, title, description) "
+            "VALUES (new.id, new.title, new.description); "
+            "END"
+        )
+    elif dialect == "postgresql":
+        op.execute(
+            "ALTER TABLE todos ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', "
+            "coalesce(title, '') || ' ' || coalesce(description, ''))) "
+            "STORED"
+        )
+        op.execute(
+            "CREATE INDEX ix_todos_search_vector "
+            "ON todos USING gin (search_vector)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS todos_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS todos_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS todos_fts_ai")
+        op.execute("DROP TABLE IF EXISTS todos_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_todos_search_vector")
+        op.execute("ALTER TABLE todos DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,74 @@
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import BoundedSemaphore, Lock
+
+from fast_zero.cache import TTLCache
+from fast_zero.settings import get_settings
+
+
+class TokenBucketLimiter:
+    def __init__(self, rate: float, burst: int, maxsize: int):
+        self.rate = rate
+        self.burst = burst
+        # A bucket left alone for burst / rate seconds is full again, which
+        # is exactly what a missing key means, so idle buckets can expire.
+        # Past maxsize the least recently used bucket is dropped and that
+        # key starts over with a full burst.
+        self._buckets = TTLCache(maxsize=maxsize, ttl=burst / rate)
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def acquire(self, key) -> float:
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+            if tokens < 1:
+                return (1 - tokens) / self.rate
+
+            self._buckets.set(key, (tokens - 1, now))
+            return 0.0
+
+    def clear(self):
+        self._buckets.clear()
+
+
+class ConcurrencyLimiter:
+    def __init__(self, limit: int):
+        self._slots = BoundedSemaphore(limit)
+
+    def try_acquire(self) -> bool:
+        return self._slots.acquire(blocking=False)
+
+    def release(self):
+        self._slots.release()
+
+
+@dataclass(frozen=True)
+class LoginAdmission:
+    by_ip: TokenBucketLimiter
+    by_username: TokenBucketLimiter
+    concurrency: ConcurrencyLimiter
+
+
+@lru_cache
+def get_login_admission() -> LoginAdmission:
+    settings = get_settings()
+    return LoginAdmission(
+        by_ip=TokenBucketLimiter(
+            rate=settings.LOGIN_IP_RATE_PER_SECOND,
+            burst=settings.LOGIN_IP_BURST,
+            maxsize=settings.LOGIN_LIMITER_MAXSIZE,
+        ),
+        by_username=TokenBucketLimiter(
+            rate=settings.LOGIN_USERNAME_RATE_PER_SECOND,
+            burst=settings.LOGIN_USERNAME_BURST,
+            maxsize=settings.LOGIN_LIMITER_MAXSIZE,
+        ),
+        concurrency=ConcurrencyLimiter(settings.LOGIN_MAX_CONCURRENCY),
+    )
@@ -1,17 +1,57 @@
+import signal
 from http import HTTPStatus
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
+from fast_zero.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    registry,
+    render_metrics,
+)
+from fast_zero.middleware import MetricsMiddleware
 from fast_zero.routers import auth, todos, users
 from fast_zero.schemas import MessageSchema
+from fast_zero.settings import get_settings, reload_settings_on_signal
 
-app = FastAPI()
+if hasattr(signal, "SIGHUP"):
+    signal.signal(signal.SIGHUP, reload_settings_on_signal)
 
-app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(todos.router)
 
-
-@app.get("/", status_code=HTTPStatus.OK, response_model=MessageSchema)
 def read_root():
     return {"message": "Hello, World!"}
+
+
+def read_metrics():
+    return Response(
+        render_metrics(registry),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
+
+
+def create_app(async_mode: bool = False) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    for module in (auth, users, todos):
+        app.include_router(
+            module.async_router if async_mode else module.router
+        )
+
+    app.add_api_route(
+        "/",
+        read_root,
+        methods=["GET"],
+        status_code=HTTPStatus.OK,
+        response_model=MessageSchema,
+    )
+    app.add_api_route(
+        "/metrics",
+        read_metrics,
+        methods=["GET"],
+        include_in_schema=False,
+    )
+
+    return app
+
+
+app = create_app(async_mode=get_settings().ASYNC_MODE)
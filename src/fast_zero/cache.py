@@ -0,0 +1,91 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from fast_zero.metrics import cache_entries, cache_hits, cache_misses
+
+_MISSING = object()
+
+
+class TTLCache:
+    # Caches given a name report hits, misses and size on /metrics.
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float | None = None,
+        name: str | None = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.labels = (name,) if name else None
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+
+            if item is _MISSING:
+                self._miss()
+                return default
+
+            value, expires_at = item
+
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self._record_size()
+                self._miss()
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+
+            if self.labels:
+                cache_hits.inc(labels=self.labels)
+
+            return value
+
+    def _miss(self):
+        self.misses += 1
+
+        if self.labels:
+            cache_misses.inc(labels=self.labels)
+
+    def set(self, key, value, expires_at: float | None = None):
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+            self._record_size()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, _MISSING)
+            self._record_size()
+
+        if item is _MISSING:
+            return default
+
+        return item[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self._record_size()
+
+    def _record_size(self):
+        if self.labels:
+            cache_entries.set(len(self._data), self.labels)
@@ -1,11 +1,484 @@
-from sqlalchemy import create_engine
+import heapq
+import itertools
+import logging
+import math
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from hashlib import sha256
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import Engine, create_engine, event, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
+
+from fast_zero.cache import TTLCache
+from fast_zero.metrics import (
+    db_pool_checked_out,
+    db_pool_checkout_wait,
+    db_pool_checkouts,
+    db_pool_connections,
+    db_pool_invalidations,
+    db_replica_failovers,
+    db_statement_duration,
+)
+from fast_zero.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_STATEMENTS = 5
+LAST_WRITE_COOKIE = "last_write"
+
+
+class QueryRecorder:
+    __slots__ = (
+        "statements",
+        "seconds",
+        "_slowest_size",
+        "_slowest",
+        "_token",
+    )
+
+    def __init__(self, slowest: int = SLOWEST_STATEMENTS):
+        self.statements = 0
+        self.seconds = 0.0
+        self._slowest_size = slowest
+        self._slowest = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = query_recorders.set((*query_recorders.get(), self))
+        return self
+
+    def __exit__(self, *_):
+        query_recorders.reset(self._token)
+
+    def record(self, statement: str, elapsed: float):
+        self.statements += 1
+        self.seconds += elapsed
+        entry = (elapsed, self.statements, statement)
+
+        if len(self._slowest) < self._slowest_size:
+            heapq.heappush(self._slowest, entry)
+        elif elapsed > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest(self) -> list[tuple[float, str]]:
+        return [
+            (elapsed, statement)
+            for elapsed, _, statement in sorted(self._slowest, reverse=True)
+        ]
+
+
+# Recorders are entered per request by the metrics middleware, and by
+# tests around whole blocks of requests. Threadpool workers and the async
+# engine's greenlets run on a copy of the caller's context, so every
+# statement reaches all the recorders that were active when it was sent.
+query_recorders: ContextVar[tuple[QueryRecorder, ...]] = ContextVar(
+    "query_recorders",
+    default=(),
+)
+
+
+class CheckoutTimingMixin:
+    def _do_get(self):
+        start = time.perf_counter()
+
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def is_sqlite_memory(url: str) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in {
+        None,
+        "",
+        ":memory:",
+    }
+
+
+def engine_options(settings: Settings, url: str, is_async: bool) -> dict:
+    if is_sqlite_memory(url):
+        return {}
+
+    return {
+        "poolclass": (
+            TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool
+        ),
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    }
+
+
+def set_sqlite_pragmas(settings: Settings, dbapi_connection):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
+def record_statement(execute, cursor, statement: str, *args) -> bool:
+    start = time.perf_counter()
+
+    try:
+        execute(cursor, statement, *args)
+    finally:
+        elapsed = time.perf_counter() - start
+        db_statement_duration.observe(elapsed)
+
+        for recorder in query_recorders.get():
+            recorder.record(statement, elapsed)
+
+        # Only the parameterized SQL is logged, never the bound values.
+        if elapsed * 1000 >= get_settings().SLOW_QUERY_MS:
+            logger.warning(
+                "Slow query took %.1f ms: %s",
+                elapsed * 1000,
+                statement,
+            )
+
+    return True
+
+
+# Dialect hooks wrap the DBAPI call itself. before/after_cursor_execute
+# would be simpler, but any Connection event moves every execute, begin
+# and commit on the engine to SQLAlchemy's slower dispatch path, which
+# costs more than the timing does.
+def instrument_statements(engine: Engine):
+    dialect = engine.dialect
+
+    @event.listens_for(engine, "do_execute")
+    def on_do_execute(cursor, statement, parameters, context):
+        return record_statement(
+            dialect.do_execute,
+            cursor,
+            statement,
+            parameters,
+            context,
+        )
+
+    @event.listens_for(engine, "do_executemany")
+    def on_do_executemany(cursor, statement, parameters, context):
+        return record_statement(
+            dialect.do_executemany,
+            cursor,
+            statement,
+            parameters,
+            context,
+        )
+
+    @event.listens_for(engine, "do_execute_no_params")
+    def on_do_execute_no_params(cursor, statement, context):
+        return record_statement(
+            dialect.do_execute_no_params,
+            cursor,
+            statement,
+            context,
+        )
+
+
+def instrument_engine(engine: Engine, settings: Settings):
+    instrument_statements(engine)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        db_pool_connections.inc()
+
+        if engine.dialect.name == "sqlite":
+            set_sqlite_pragmas(settings, dbapi_connection)
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checkouts.inc()
+        db_pool_checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        db_pool_checked_out.dec()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        db_pool_invalidations.inc()
+
+
+def build_engine(url: str, settings: Settings | None = None) -> Engine:
+    settings = settings or get_settings()
+    engine = create_engine(
+        url,
+        **engine_options(settings, url, is_async=False),
+    )
+    instrument_engine(engine, settings)
+    return engine
+
+
+def build_async_engine(
+    url: str,
+    settings: Settings | None = None,
+) -> AsyncEngine:
+    settings = settings or get_settings()
+    engine = create_async_engine(
+        url,
+        **engine_options(settings, url, is_async=True),
+    )
+    instrument_engine(engine.sync_engine, settings)
+    return engine
+
+
+engine = build_engine(get_settings().DATABASE_URL)
+
+
+def sqlite_async_url(url: str, setting: str) -> str:
+    url = make_url(url)
+
+    if url.get_backend_name() != "sqlite":
+        raise ValueError(f"{setting} must be set for non-SQLite databases")
+
+    return url.set(drivername="sqlite+aiosqlite").render_as_string(
+        hide_password=False,
+    )
+
 
-from fast_zero.settings import Settings
+def get_async_database_url() -> str:
+    settings = get_settings()
 
-engine = create_engine(Settings().DATABASE_URL)
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
 
+    return sqlite_async_url(settings.DATABASE_URL, "ASYNC_DATABASE_URL")
 
-def get_session():  # pragma: no cover
-    with Session(engine) as session:
+
+def get_async_database_read_urls() -> list[str]:
+    settings = get_settings()
+
+    if settings.ASYNC_DATABASE_READ_URLS:
+        return settings.ASYNC_DATABASE_READ_URLS
+
+    return [
+        sqlite_async_url(url, "ASYNC_DATABASE_READ_URLS")
+        for url in settings.DATABASE_READ_URLS
+    ]
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    return build_async_engine(get_async_database_url())
+
+
+class ReplicaSet:
+    def __init__(self, engines, retry_seconds: float):
+        self.engines = list(engines)
+        self.retry_seconds = retry_seconds
+        self._down_until = {}
+        self._turns = itertools.count()
+
+    def __bool__(self):
+        return bool(self.engines)
+
+    def candidates(self) -> list:
+        start = next(self._turns) % len(self.engines)
+        ordered = self.engines[start:] + self.engines[:start]
+        now = time.monotonic()
+        return [
+            replica
+            for replica in ordered
+            if self._down_until.get(replica, 0) <= now
+        ]
+
+    def mark_down(self, replica):
+        self._down_until[replica] = time.monotonic() + self.retry_seconds
+        db_replica_failovers.inc()
+        logger.warning(
+            "Read replica %s is unavailable, skipping it for %.0f s",
+            replica.url,
+            self.retry_seconds,
+        )
+
+
+@lru_cache
+def get_read_replicas() -> ReplicaSet:
+    settings = get_settings()
+    return ReplicaSet(
+        [build_engine(url) for url in settings.DATABASE_READ_URLS],
+        settings.DATABASE_READ_RETRY_SECONDS,
+    )
+
+
+@lru_cache
+def get_async_read_replicas() -> ReplicaSet:
+    return ReplicaSet(
+        [build_async_engine(url) for url in get_async_database_read_urls()],
+        get_settings().DATABASE_READ_RETRY_SECONDS,
+    )
+
+
+# Keyed by the bearer credential, so clients that drop cookies still read
+# their own writes. It is the only identity known before the read session
+# that resolves the user is chosen.
+recent_writers = TTLCache(
+    maxsize=get_settings().DATABASE_READ_STICKY_MAXSIZE,
+    ttl=get_settings().DATABASE_READ_STICKY_SECONDS,
+)
+
+
+def writer_key(request: Request) -> bytes | None:
+    authorization = request.headers.get("authorization")
+    return sha256(authorization.encode()).digest() if authorization else None
+
+
+def remember_write(request: Request | None, response: Response | None):
+    settings = get_settings()
+
+    if request is None or not settings.DATABASE_READ_URLS:
+        return
+
+    if key := writer_key(request):
+        recent_writers.set(key, True)
+
+    response.set_cookie(
+        LAST_WRITE_COOKIE,
+        f"{time.time():.3f}",
+        max_age=math.ceil(settings.DATABASE_READ_STICKY_SECONDS),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def wrote_recently(request: Request) -> bool:
+    key = writer_key(request)
+
+    if key and recent_writers.get(key):
+        return True
+
+    try:
+        written_at = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+
+    sticky_seconds = get_settings().DATABASE_READ_STICKY_SECONDS
+    return 0 <= time.time() - written_at < sticky_seconds
+
+
+# Commits mark the client as a recent writer, so its next reads stay on
+# the primary until the replicas have had time to catch up.
+class PrimarySession(Session):
+    def commit(self):
+        super().commit()
+        remember_write(self.info.get("request"), self.info.get("response"))
+
+
+# A replica is only handed out once it has given us a connection; one
+# that cannot is skipped by every request until its retry time is up.
+def open_read_session(replicas: ReplicaSet) -> Session | None:
+    for replica in replicas.candidates():
+        session = Session(replica)
+
+        try:
+            session.connection()
+        except OperationalError:
+            session.close()
+            replicas.mark_down(replica)
+            continue
+
+        return session
+
+    return None
+
+
+async def open_async_read_session(replicas: ReplicaSet) -> AsyncSession | None:
+    for replica in replicas.candidates():
+        session = AsyncSession(replica, expire_on_commit=False)
+
+        try:
+            await session.connection()
+        except OperationalError:
+            await session.close()
+            replicas.mark_down(replica)
+            continue
+
+        return session
+
+    return None
+
+
+def get_session(request: Request, response: Response):  # pragma: no cover
+    with PrimarySession(
+        engine,
+        info={"request": request, "response": response},
+    ) as session:
+        yield session
+
+
+async def get_async_session(
+    request: Request,
+    response: Response,
+):  # pragma: no cover
+    async with AsyncSession(
+        get_async_engine(),
+        expire_on_commit=False,
+        sync_session_class=PrimarySession,
+        info={"request": request, "response": response},
+    ) as session:
+        yield session
+
+
+# Read-only endpoints take this instead of get_session. Without replicas,
+# or right after the client wrote, it is the request's primary session.
+async def get_read_session(
+    request: Request,
+    session: Session = Depends(get_session),
+):
+    replicas = get_read_replicas()
+    read_session = None
+
+    if replicas and not wrote_recently(request):
+        read_session = await run_in_threadpool(open_read_session, replicas)
+
+    if read_session is None:
         yield session
+        return
+
+    try:
+        yield read_session
+    finally:
+        await run_in_threadpool(read_session.close)
+
+
+async def get_async_read_session(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+):
+    replicas = get_async_read_replicas()
+    read_session = None
+
+    if replicas and not wrote_recently(request):
+        read_session = await open_async_read_session(replicas)
+
+    if read_session is None:
+        yield session
+        return
+
+    async with read_session:
+        yield read_session
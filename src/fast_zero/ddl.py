@@ -0,0 +1,156 @@
+from sqlalchemy import DDL, MetaData, Table, event
+
+TODOS_SEARCH_SQLITE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5("
+    "title, description, content='todos', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS todos_fts_ai AFTER INSERT ON todos BEGIN "
+    "INSERT INTO todos_fts (rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS todos_fts_ad AFTER DELETE ON todos BEGIN "
+    "INSERT INTO todos_fts (todos_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS todos_fts_au "
+    "AFTER UPDATE OF title, description ON todos BEGIN "
+    "INSERT INTO todos_fts (todos_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO todos_fts (rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); "
+    "END",
+)
+TODOS_SEARCH_SQLITE_DROP = ("DROP TABLE IF EXISTS todos_fts",)
+
+TODOS_SEARCH_POSTGRESQL = (
+    "ALTER TABLE todos ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', "
+    "coalesce(title, '') || ' ' || coalesce(description, ''))) STORED",
+    "CREATE INDEX ix_todos_search_vector ON todos USING gin (search_vector)",
+)
+
+TODO_COUNTERS_SQLITE = (
+    "CREATE TRIGGER IF NOT EXISTS todo_counters_ai "
+    "AFTER INSERT ON todos BEGIN "
+    "INSERT INTO todo_counters (user_id, state, count) "
+    "VALUES (new.user_id, new.state, 1) "
+    "ON CONFLICT (user_id, state) DO UPDATE SET count = count + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS todo_counters_ad "
+    "AFTER DELETE ON todos BEGIN "
+    "UPDATE todo_counters SET count = count - 1 "
+    "WHERE user_id = old.user_id AND state = old.state; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS todo_counters_au "
+    "AFTER UPDATE OF user_id, state ON todos BEGIN "
+    "UPDATE todo_counters SET count = count - 1 "
+    "WHERE user_id = old.user_id AND state = old.state; "
+    "INSERT INTO todo_counters (user_id, state, count) "
+    "VALUES (new.user_id, new.state, 1) "
+    "ON CONFLICT (user_id, state) DO UPDATE SET count = count + 1; "
+    "END",
+)
+
+TODO_COUNTERS_POSTGRESQL = (
+    "CREATE OR REPLACE FUNCTION todo_counters_apply() RETURNS trigger AS $$ "
+    "BEGIN "
+    "IF TG_OP IN ('UPDATE', 'DELETE') THEN "
+    "UPDATE todo_counters SET count = count - 1 "
+    "WHERE user_id = OLD.user_id AND state = OLD.state; "
+    "END IF; "
+    "IF TG_OP IN ('INSERT', 'UPDATE') THEN "
+    "INSERT INTO todo_counters (user_id, state, count) "
+    "VALUES (NEW.user_id, NEW.state, 1) "
+    "ON CONFLICT (user_id, state) "
+    "DO UPDATE SET count = todo_counters.count + 1; "
+    "END IF; "
+    "RETURN NULL; "
+    "END $$ LANGUAGE plpgsql",
+    "CREATE TRIGGER todo_counters_sync "
+    "AFTER INSERT OR DELETE OR UPDATE OF user_id, state ON todos "
+    "FOR EACH ROW EXECUTE FUNCTION todo_counters_apply()",
+)
+TODO_COUNTERS_POSTGRESQL_DROP = (
+    "DROP FUNCTION IF EXISTS todo_counters_apply()",
+)
+
+
+REVISIONS_BUMP_SQLITE = (
+    "INSERT INTO revisions (key, version) VALUES ({key}, 1) "
+    "ON CONFLICT (key) DO UPDATE SET version = version + 1; "
+)
+REVISIONS_SQLITE = (
+    "CREATE TRIGGER IF NOT EXISTS revisions_todos_ai "
+    "AFTER INSERT ON todos BEGIN "
+    + REVISIONS_BUMP_SQLITE.format(key="'todos:' || new.user_id")
+    + "END",
+    "CREATE TRIGGER IF NOT EXISTS revisions_todos_ad "
+    "AFTER DELETE ON todos BEGIN "
+    + REVISIONS_BUMP_SQLITE.format(key="'todos:' || old.user_id")
+    + "END",
+    "CREATE TRIGGER IF NOT EXISTS revisions_todos_au "
+    "AFTER UPDATE ON todos BEGIN "
+    + REVISIONS_BUMP_SQLITE.format(key="'todos:' || old.user_id")
+    + REVISIONS_BUMP_SQLITE.format(key="'todos:' || new.user_id")
+    + "END",
+    "CREATE TRIGGER IF NOT EXISTS revisions_users_ai "
+    "AFTER INSERT ON users BEGIN "
+    + REVISIONS_BUMP_SQLITE.format(key="'users'")
+    + "END",
+    "CREATE TRIGGER IF NOT EXISTS revisions_users_ad "
+    "AFTER DELETE ON users BEGIN "
+    + REVISIONS_BUMP_SQLITE.format(key="'users'")
+    + "END",
+    "CREATE TRIGGER IF NOT EXISTS revisions_users_au "
+    "AFTER UPDATE OF username, email ON users BEGIN "
+    + REVISIONS_BUMP_SQLITE.format(key="'users'")
+    + "END",
+)
+
+REVISIONS_BUMP_POSTGRESQL = (
+    "INSERT INTO revisions (key, version) VALUES ({key}, 1) "
+    "ON CONFLICT (key) DO UPDATE SET version = revisions.version + 1; "
+)
+REVISIONS_POSTGRESQL = (
+    "CREATE OR REPLACE FUNCTION revisions_bump() RETURNS trigger AS $$ "
+    "BEGIN "
+    "IF TG_TABLE_NAME = 'users' THEN "
+    + REVISIONS_BUMP_POSTGRESQL.format(key="'users'")
+    + "ELSE "
+    "IF TG_OP IN ('UPDATE', 'DELETE') THEN "
+    + REVISIONS_BUMP_POSTGRESQL.format(key="'todos:' || OLD.user_id")
+    + "END IF; "
+    "IF TG_OP IN ('INSERT', 'UPDATE') THEN "
+    + REVISIONS_BUMP_POSTGRESQL.format(key="'todos:' || NEW.user_id")
+    + "END IF; "
+    "END IF; "
+    "RETURN NULL; "
+    "END $$ LANGUAGE plpgsql",
+    "CREATE TRIGGER revisions_todos AFTER INSERT OR UPDATE OR DELETE "
+    "ON todos FOR EACH ROW EXECUTE FUNCTION revisions_bump()",
+    "CREATE TRIGGER revisions_users "
+    "AFTER INSERT OR DELETE OR UPDATE OF username, email "
+    "ON users FOR EACH ROW EXECUTE FUNCTION revisions_bump()",
+)
+REVISIONS_POSTGRESQL_DROP = ("DROP FUNCTION IF EXISTS revisions_bump()",)
+
+
+def attach_ddl(
+    target: Table | MetaData,
+    dialect: str,
+    create=(),
+    drop=(),
+):
+    for statement in create:
+        event.listen(
+            target,
+            "after_create",
+            DDL(statement).execute_if(dialect=dialect),
+        )
+
+    for statement in drop:
+        event.listen(
+            target,
+            "after_drop",
+            DDL(statement).execute_if(dialect=dialect),
+        )
@@ -0,0 +1,46 @@
+import hashlib
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import select
+
+from fast_zero.models import Revision
+
+
+def revision_query(key: str):
+    return select(Revision.version).where(Revision.key == key)
+
+
+def listing_etag(key: str, version: int | None, request: Request) -> str:
+    params = urlencode(sorted(request.query_params.multi_items()))
+    digest = hashlib.sha256(f"{key}:{version or 0}?{params}".encode())
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+
+    if not header:
+        return False
+
+    # If-None-Match uses weak comparison, so W/"x" and "x" are equal.
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def check_etag(
+    request: Request,
+    response: Response,
+    key: str,
+    version: int | None,
+):
+    etag = listing_etag(key, version, request)
+
+    if etag_matches(request, etag):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_MODIFIED,
+            headers={"ETag": etag},
+        )
+
+    response.headers["ETag"] = etag
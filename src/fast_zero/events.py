@@ -0,0 +1,224 @@
+import asyncio
+import json
+import secrets
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import count
+from threading import Lock
+
+from fast_zero.cache import TTLCache
+from fast_zero.settings import get_settings
+
+
+class ChangeHistoryExpiredError(Exception):
+    pass
+
+
+def format_cursor(epoch: str, revision: int) -> str:
+    return f"{epoch}.{revision}"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    revision: int
+    type: str
+    data: dict
+    epoch: str
+
+    @property
+    def cursor(self) -> str:
+        return format_cursor(self.epoch, self.revision)
+
+    def as_dict(self) -> dict:
+        return {
+            "revision": self.cursor,
+            "type": self.type,
+            "data": self.data,
+        }
+
+    def as_sse(self) -> str:
+        data = json.dumps(self.data, default=str)
+        return f"id: {self.cursor}\nevent: {self.type}\ndata: {data}\n\n"
+
+
+@dataclass
+class ChangeLog:
+    # Revisions up to the floor are unknown: trimmed from the history or
+    # published before this log was (re)created.
+    floor: int
+    events: deque = field(default_factory=deque)
+
+    @property
+    def revision(self) -> int:
+        return self.events[-1].revision if self.events else self.floor
+
+
+class ChangeBroker:
+    def __init__(self, history_size: int, max_users: int):
+        self.history_size = history_size
+        self._logs = TTLCache(maxsize=max_users)
+        self._sequence = count(1)
+        self._last_revision = 0
+        self._evicted_revision = 0
+        self._subscribers = defaultdict(set)
+        self._lock = Lock()
+        # Revisions count from 1 in every process, so clients get them
+        # prefixed with an epoch that tells this broker's apart from those
+        # of an earlier process or another worker.
+        self.epoch = secrets.token_hex(4)
+
+    def _log(self, user_id: int) -> ChangeLog:
+        log = self._logs.get(user_id)
+
+        if log is None:
+            # Once some user's log has been evicted, a new log cannot tell
+            # whether it is that user coming back, so it trusts nothing older.
+            if len(self._logs) >= self._logs.maxsize:
+                self._evicted_revision = self._last_revision
+
+            log = ChangeLog(floor=self._evicted_revision)
+            self._logs.set(user_id, log)
+
+        return log
+
+    def publish(self, user_id: int, type_: str, data: dict) -> ChangeEvent:
+        with self._lock:
+            log = self._log(user_id)
+            self._last_revision = next(self._sequence)
+            event = ChangeEvent(self._last_revision, type_, data, self.epoch)
+
+            if len(log.events) >= self.history_size:
+                log.floor = log.events.popleft().revision
+
+            log.events.append(event)
+            subscribers = list(self._subscribers.get(user_id, ()))
+
+        # Writers run on worker threads, subscribers on the event loop.
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        return event
+
+    def revision(self, user_id: int) -> int:
+        with self._lock:
+            return self._log(user_id).revision
+
+    def cursor(self, revision: int) -> str:
+        return format_cursor(self.epoch, revision)
+
+    # "0" asks for everything still in the history. Any other cursor must
+    # come from this broker; one from another epoch cannot be mapped onto
+    # these revisions.
+    def parse_cursor(self, cursor: str) -> int:
+        if cursor == "0":
+            return 0
+
+        epoch, _, revision = cursor.partition(".")
+
+        if epoch != self.epoch or not revision.isdigit():
+            raise ChangeHistoryExpiredError(cursor)
+
+        return int(revision)
+
+    def events_since(self, user_id: int, revision: int) -> list[ChangeEvent]:
+        with self._lock:
+            log = self._log(user_id)
+
+            if revision < log.floor or revision > log.revision:
+                raise ChangeHistoryExpiredError(revision)
+
+            return [event for event in log.events if event.revision > revision]
+
+    @contextmanager
+    def subscribe(self, user_id: int):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+
+        with self._lock:
+            self._subscribers[user_id].add(subscriber)
+
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                subscribers = self._subscribers[user_id]
+                subscribers.discard(subscriber)
+
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(map(len, self._subscribers.values()))
+
+    def clear(self):
+        with self._lock:
+            self._logs.clear()
+            self._sequence = count(1)
+            self._last_revision = 0
+            self._evicted_revision = 0
+            self.epoch = secrets.token_hex(4)
+
+
+broker = ChangeBroker(
+    history_size=get_settings().CHANGES_HISTORY_SIZE,
+    max_users=get_settings().CHANGES_MAX_USERS,
+)
+
+
+async def wait_for_changes(
+    user_id: int,
+    since: str | None,
+    timeout: float,
+) -> dict:
+    with broker.subscribe(user_id) as queue:
+        start = (
+            broker.revision(user_id)
+            if since is None
+            else broker.parse_cursor(since)
+        )
+        events = broker.events_since(user_id, start)
+
+        if not events:
+            try:
+                await asyncio.wait_for(queue.get(), timeout)
+            except TimeoutError:
+                pass
+
+            events = broker.events_since(user_id, start)
+
+    return {
+        "revision": broker.cursor(events[-1].revision if events else start),
+        "events": [event.as_dict() for event in events],
+    }
+
+
+async def stream_changes(
+    user_id: int,
+    last_event_id: str | None,
+    heartbeat: float,
+):
+    with broker.subscribe(user_id) as queue:
+        seen = broker.revision(user_id)
+
+        if last_event_id is not None:
+            try:
+                revision = broker.parse_cursor(last_event_id)
+
+                for event in broker.events_since(user_id, revision):
+                    seen = event.revision
+                    yield event.as_sse()
+            except ChangeHistoryExpiredError:
+                cursor = broker.cursor(seen)
+                yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), heartbeat)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if event.revision > seen:
+                seen = event.revision
+                yield event.as_sse()
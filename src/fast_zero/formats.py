@@ -0,0 +1,213 @@
+import codecs
+import csv
+import io
+import json
+from enum import Enum
+from http import HTTPStatus
+from itertools import islice
+from typing import BinaryIO
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import String, select, type_coerce
+
+from fast_zero.models import Todo
+from fast_zero.schemas import TodoSchema
+
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_LINE_BYTES = 1_048_576
+EXPORT_FIELDS = ("id", "title", "description", "state")
+
+
+class ImportRowError(Exception):
+    pass
+
+
+class DataFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    DataFormat.ndjson: "application/x-ndjson",
+    DataFormat.csv: "text/csv",
+}
+
+
+def export_todos_query(user_id: int):
+    return (
+        select(
+            Todo.id,
+            Todo.title,
+            Todo.description,
+            # Plain strings serialize as-is, without going through the enum.
+            type_coerce(Todo.state, String).label("state"),
+        )
+        .where(Todo.user_id == user_id)
+        .order_by(Todo.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def export_header(data_format: DataFormat) -> str:
+    if data_format == DataFormat.csv:
+        return ",".join(EXPORT_FIELDS) + "\r\n"
+
+    return ""
+
+
+def serialize_rows(rows, data_format: DataFormat) -> str:
+    if data_format == DataFormat.csv:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in rows
+    )
+
+
+def validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        ".".join(map(str, item["loc"])) + f": {item['msg']}"
+        if item["loc"]
+        else item["msg"]
+        for item in error.errors()
+    )
+
+
+def validate_bulk(
+    items,
+    schema: type[BaseModel],
+    start: int = 0,
+    json_lines: bool = False,
+):
+    validate = (
+        schema.model_validate_json if json_lines else (schema.model_validate)
+    )
+    valid, errors = [], []
+
+    for index, item in enumerate(items, start):
+        if isinstance(item, ImportRowError):
+            errors.append({"index": index, "detail": str(item)})
+            continue
+
+        try:
+            valid.append((index, validate(item)))
+        except ValidationError as error:
+            errors.append({"index": index, "detail": validation_detail(error)})
+
+    return valid, errors
+
+
+def batched(iterable, size: int):
+    iterator = iter(iterable)
+
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# Uploads are read a bounded line at a time and decoded strictly, so a
+# huge or undecodable line costs one rejected row instead of the memory
+# for the whole line or a silently rewritten title.
+class ImportLines:
+    def __init__(self, binary_file: BinaryIO, max_bytes: int):
+        self._file = binary_file
+        self._max_bytes = max_bytes
+        self._first = True
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self._file.readline(self._max_bytes + 1)
+
+        if not line:
+            raise StopIteration
+
+        if self._first:
+            line = line.removeprefix(codecs.BOM_UTF8)
+            self._first = False
+
+        if len(line) > self._max_bytes:
+            self._skip_rest_of_line(line)
+            raise ImportRowError(
+                f"line is longer than {self._max_bytes} bytes",
+            )
+
+        try:
+            return line.decode("utf-8")
+        except UnicodeDecodeError:
+            raise ImportRowError("line is not valid UTF-8")
+
+    def _skip_rest_of_line(self, line: bytes):
+        while line and not line.endswith(b"\n"):
+            line = self._file.readline(self._max_bytes)
+
+
+def invalid_csv_header_exception(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.BAD_REQUEST,
+        detail=f"Invalid CSV header: {detail}",
+    )
+
+
+# A header that cannot be read would otherwise let DictReader take the
+# first data row as the header, and that row would vanish from the counts.
+def read_csv_header(lines: ImportLines) -> list[str] | None:
+    try:
+        line = next(lines, None)
+
+        if line is None:
+            return None
+
+        fieldnames = next(csv.reader([line]))
+    except (ImportRowError, csv.Error) as error:
+        raise invalid_csv_header_exception(str(error))
+
+    if missing := [
+        name for name in TodoSchema.model_fields if name not in fieldnames
+    ]:
+        raise invalid_csv_header_exception(
+            "missing " + ", ".join(missing),
+        )
+
+    return fieldnames
+
+
+def import_records(binary_file: BinaryIO, data_format: DataFormat):
+    lines = ImportLines(binary_file, IMPORT_MAX_LINE_BYTES)
+
+    if data_format == DataFormat.ndjson:
+        records = lines
+    elif fieldnames := read_csv_header(lines):
+        records = csv.DictReader(lines, fieldnames=fieldnames)
+    else:
+        return
+
+    while True:
+        try:
+            record = next(records)
+        except StopIteration:
+            return
+        except (ImportRowError, csv.Error) as error:
+            yield ImportRowError(str(error))
+            continue
+
+        if data_format == DataFormat.csv or record.strip():
+            yield record
+
+
+def import_batches(binary_file: BinaryIO, data_format: DataFormat, user_id):
+    json_lines = data_format == DataFormat.ndjson
+    records = import_records(binary_file, data_format)
+    start = 0
+
+    for batch in batched(records, IMPORT_BATCH_SIZE):
+        todos, errors = validate_bulk(batch, TodoSchema, start, json_lines)
+        start += len(batch)
+        yield (
+            [{**todo.model_dump(), "user_id": user_id} for _, todo in todos],
+            errors,
+        )
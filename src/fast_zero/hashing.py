@@ -0,0 +1,64 @@
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from threading import BoundedSemaphore
+
+from fast_zero.metrics import password_hashing_duration
+from fast_zero.settings import get_settings
+
+
+def timed_hash(fn, *args):
+    start = time.perf_counter()
+
+    try:
+        return fn(*args)
+    finally:
+        password_hashing_duration.observe(time.perf_counter() - start)
+
+
+class HashingPoolSaturatedError(Exception):
+    pass
+
+
+class HashingExecutor:
+    def __init__(self, max_workers: int, max_queue: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hashing",
+        )
+        self._slots = BoundedSemaphore(max_workers + max_queue)
+
+    def submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolSaturatedError
+
+        try:
+            future = self._executor.submit(timed_hash, fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def run(self, fn, *args):
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release_slot(self, _future: Future):
+        self._slots.release()
+
+
+@lru_cache
+def get_hashing_executor() -> HashingExecutor:
+    settings = get_settings()
+    return HashingExecutor(
+        max_workers=settings.HASHING_MAX_WORKERS,
+        max_queue=settings.HASHING_MAX_QUEUE,
+    )
@@ -0,0 +1,45 @@
+import argparse
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from fast_zero.database import engine
+from fast_zero.models import Todo, TodoCounter
+
+
+def rebuild_todo_counters(session: Session) -> int:
+    if session.get_bind().dialect.name == "postgresql":
+        # Keeps writers (and their counter triggers) out until the
+        # rebuilt counts are committed.
+        session.execute(text("LOCK TABLE todos IN SHARE MODE"))
+
+    session.execute(delete(TodoCounter))
+    result = session.execute(
+        insert(TodoCounter).from_select(
+            ["user_id", "state", "count"],
+            select(Todo.user_id, Todo.state, func.count()).group_by(
+                Todo.user_id,
+                Todo.state,
+            ),
+        )
+    )
+    session.commit()
+    return result.rowcount
+
+
+COMMANDS = {"rebuild-counters": rebuild_todo_counters}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m fast_zero.maintenance")
+    parser.add_argument("command", choices=COMMANDS)
+    args = parser.parse_args(argv)
+
+    with Session(engine) as session:
+        rows = COMMANDS[args.command](session)
+
+    print(f"{args.command}: {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
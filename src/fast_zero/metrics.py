@@ -0,0 +1,356 @@
+import math
+from bisect import bisect_left
+from collections import defaultdict
+from threading import Lock
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = defaultdict(float)
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1.0, labels=()):
+        with self._lock:
+            self._values[labels] += amount
+
+    def value(self, labels=()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+
+        for labels, value in values:
+            yield self.name, tuple(zip(self.labelnames, labels)), value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1.0, labels=()):
+        self.inc(-amount, labels)
+
+    def set(self, value: float, labels=()):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets=DEFAULT_BUCKETS,
+        lock=None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = lock or Lock()
+
+    def observe(self, value: float, labels=()):
+        with self._lock:
+            self._observe(value, labels)
+
+    # Callers must hold the histogram's lock.
+    def _observe(self, value: float, labels):
+        series = self._get_series(labels)
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    # Callers must hold the histogram's lock.
+    def _get_series(self, labels) -> list:
+        series = self._series.get(labels)
+
+        if series is None:
+            series = self._series[labels] = [
+                [0] * (len(self.buckets) + 1),
+                0.0,
+            ]
+
+        return series
+
+    def count(self, labels=()) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def sum(self, labels=()) -> float:
+        series = self._series.get(labels)
+        return series[1] if series else 0.0
+
+    def samples(self):
+        with self._lock:
+            series = [
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._series.items()
+            ]
+
+        for labels, counts, total in series:
+            label_pairs = tuple(zip(self.labelnames, labels))
+            cumulative = 0
+
+            for bound, bucket_count in zip(
+                (*self.buckets, float("inf")),
+                counts,
+            ):
+                cumulative += bucket_count
+                yield (
+                    f"{self.name}_bucket",
+                    (*label_pairs, ("le", bound)),
+                    cumulative,
+                )
+
+            yield f"{self.name}_count", label_pairs, cumulative
+            yield f"{self.name}_sum", label_pairs, total
+
+    def clear(self):
+        with self._lock:
+            for series in self._series.values():
+                series[:] = [[0] * (len(self.buckets) + 1), 0.0]
+
+
+# The three per-request histograms share a lock, so a request takes it
+# once. The series for each method, route and status are looked up on the
+# first request and kept, so later ones only bump counters; clear() resets
+# the series in place to keep those references valid.
+class RequestMetrics:
+    def __init__(self, duration, statements, statement_duration, lock):
+        self.duration = duration
+        self.statements = statements
+        self.statement_duration = statement_duration
+        self._lock = lock
+        self._series = {}
+
+    def _add_series(self, method: str, route: str, status: int):
+        labels = (method, route)
+        series = self._series[method, route, status] = (
+            self.duration._get_series((*labels, str(status))),
+            self.statements._get_series(labels),
+            self.statement_duration._get_series(labels),
+        )
+        return series
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        elapsed: float,
+        recorder,
+    ):
+        with self._lock:
+            duration, statements, statement_duration = self._series.get(
+                (method, route, status)
+            ) or self._add_series(method, route, status)
+
+            duration[0][bisect_left(self.duration.buckets, elapsed)] += 1
+            duration[1] += elapsed
+            count = recorder.statements
+
+            # Most requests run no SQL, and zero is the first bucket of both
+            # statement histograms.
+            if not count:
+                statements[0][0] += 1
+                statement_duration[0][0] += 1
+                return
+
+            seconds = recorder.seconds
+            statements[0][bisect_left(self.statements.buckets, count)] += 1
+            statements[1] += count
+            statement_duration[0][
+                bisect_left(self.statement_duration.buckets, seconds)
+            ] += 1
+            statement_duration[1] += seconds
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def collect(self):
+        return list(self._metrics.values())
+
+    def clear(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+
+    return str(value)
+
+
+def format_labels(label_pairs) -> str:
+    if not label_pairs:
+        return ""
+
+    labels = ",".join(
+        f'{name}="{escape_label(value)}"' for name, value in label_pairs
+    )
+    return f"{{{labels}}}"
+
+
+def escape_label(value) -> str:
+    if isinstance(value, float):
+        return format_value(value)
+
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def render_metrics(metrics_registry: MetricsRegistry) -> str:
+    lines = []
+
+    for metric in metrics_registry.collect():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(
+            f"{name}{format_labels(label_pairs)} {format_value(value)}"
+            for name, label_pairs, value in metric.samples()
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+db_pool_checkouts = registry.register(
+    Counter("db_pool_checkouts_total", "Connections checked out of the pool")
+)
+db_pool_connections = registry.register(
+    Counter(
+        "db_pool_connections_created_total",
+        "New DBAPI connections opened by the pool",
+    )
+)
+db_pool_invalidations = registry.register(
+    Counter(
+        "db_pool_invalidations_total",
+        "Pooled connections invalidated",
+    )
+)
+db_pool_checked_out = registry.register(
+    Gauge("db_pool_checked_out", "Connections currently checked out")
+)
+db_replica_failovers = registry.register(
+    Counter(
+        "db_replica_failovers_total",
+        "Read replicas taken out of rotation after failing to connect",
+    )
+)
+db_pool_checkout_wait = registry.register(
+    Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a pooled connection",
+    )
+)
+
+http_request_lock = Lock()
+# Request counts per status are the _count series of this histogram.
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time to handle an HTTP request",
+        ("method", "route", "status"),
+        lock=http_request_lock,
+    )
+)
+http_request_statements = registry.register(
+    Histogram(
+        "http_request_db_statements",
+        "SQL statements executed per HTTP request",
+        ("method", "route"),
+        buckets=STATEMENT_BUCKETS,
+        lock=http_request_lock,
+    )
+)
+http_request_statement_duration = registry.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time spent executing SQL per HTTP request",
+        ("method", "route"),
+        lock=http_request_lock,
+    )
+)
+http_requests = RequestMetrics(
+    http_request_duration,
+    http_request_statements,
+    http_request_statement_duration,
+    http_request_lock,
+)
+db_statement_duration = registry.register(
+    Histogram(
+        "db_statement_duration_seconds",
+        "Time spent executing a single SQL statement",
+    )
+)
+password_hashing_duration = registry.register(
+    Histogram(
+        "password_hashing_duration_seconds",
+        "Time spent hashing or verifying a password",
+    )
+)
+login_rejections = registry.register(
+    Counter(
+        "login_rejections_total",
+        "Login attempts rejected before reaching the database",
+        ("reason",),
+    )
+)
+cache_hits = registry.register(
+    Counter("cache_hits_total", "In-process cache lookups served", ("cache",))
+)
+cache_misses = registry.register(
+    Counter(
+        "cache_misses_total",
+        "In-process cache lookups that found nothing or an expired entry",
+        ("cache",),
+    )
+)
+cache_entries = registry.register(
+    Gauge("cache_entries", "Entries held by an in-process cache", ("cache",))
+)
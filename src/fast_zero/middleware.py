@@ -0,0 +1,80 @@
+import logging
+import time
+from http import HTTPStatus
+
+from fast_zero.database import QueryRecorder
+from fast_zero.metrics import http_requests
+from fast_zero.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Enum attribute access is slow enough to show up per request.
+DEFAULT_STATUS = HTTPStatus.INTERNAL_SERVER_ERROR.value
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = DEFAULT_STATUS
+
+        # Hands back send's own awaitable instead of wrapping it in another
+        # coroutine, which would cost a frame on every message.
+        def send_with_status(message):
+            nonlocal status
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+            return send(message)
+
+        start = time.perf_counter()
+
+        with QueryRecorder() as recorder:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                elapsed = time.perf_counter() - start
+                record_request(scope, status, elapsed, recorder)
+
+
+# Routes are labelled by their template, never by the raw path, so ids in
+# URLs cannot grow the number of series without bound.
+def record_request(
+    scope,
+    status: int,
+    elapsed: float,
+    recorder: QueryRecorder,
+):
+    route = scope.get("route")
+    method = scope["method"]
+    path = route.path if route else "unmatched"
+
+    http_requests.observe(method, path, status, elapsed, recorder)
+
+    # Many fast statements can add up to a slow request without any one of
+    # them crossing the threshold, so the request total is checked too.
+    if (
+        recorder.statements
+        and recorder.seconds * 1000 >= get_settings().SLOW_QUERY_MS
+    ):
+        log_slow_request((method, path), recorder)
+
+
+def log_slow_request(labels, recorder: QueryRecorder):
+    slowest = "".join(
+        f"\n  {elapsed * 1000:.1f} ms: {statement}"
+        for elapsed, statement in recorder.slowest
+    )
+    logger.warning(
+        "%s %s spent %.1f ms in %d SQL statements; slowest:%s",
+        *labels,
+        recorder.seconds * 1000,
+        recorder.statements,
+        slowest,
+    )
@@ -1,9 +1,22 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, registry
 
+from fast_zero.ddl import (
+    REVISIONS_POSTGRESQL,
+    REVISIONS_POSTGRESQL_DROP,
+    REVISIONS_SQLITE,
+    TODO_COUNTERS_POSTGRESQL,
+    TODO_COUNTERS_POSTGRESQL_DROP,
+    TODO_COUNTERS_SQLITE,
+    TODOS_SEARCH_POSTGRESQL,
+    TODOS_SEARCH_SQLITE,
+    TODOS_SEARCH_SQLITE_DROP,
+    attach_ddl,
+)
+
 table_registry = registry()
 
 
@@ -32,6 +45,10 @@ class User:
 @table_registry.mapped_as_dataclass
 class Todo:
     __tablename__ = "todos"
+    __table_args__ = (
+        Index("ix_todos_user_id_state_id", "user_id", "state", "id"),
+        Index("ix_todos_user_id_id", "user_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str]
@@ -39,3 +56,46 @@ class Todo:
     state: Mapped[TodoState]
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+
+
+@table_registry.mapped_as_dataclass
+class TodoCounter:
+    __tablename__ = "todo_counters"
+
+    # Counters outlive a user's last todo at zero, so they must not keep
+    # the user from being deleted.
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    state: Mapped[TodoState] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(default=0)
+
+
+@table_registry.mapped_as_dataclass
+class Revision:
+    __tablename__ = "revisions"
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(default=0)
+
+
+attach_ddl(
+    Todo.__table__,
+    "sqlite",
+    create=TODOS_SEARCH_SQLITE,
+    drop=TODOS_SEARCH_SQLITE_DROP,
+)
+attach_ddl(Todo.__table__, "postgresql", create=TODOS_SEARCH_POSTGRESQL)
+# These triggers span several tables, so they wait for all of them to exist.
+attach_ddl(
+    table_registry.metadata,
+    "sqlite",
+    create=TODO_COUNTERS_SQLITE + REVISIONS_SQLITE,
+)
+attach_ddl(
+    table_registry.metadata,
+    "postgresql",
+    create=TODO_COUNTERS_POSTGRESQL + REVISIONS_POSTGRESQL,
+    drop=TODO_COUNTERS_POSTGRESQL_DROP + REVISIONS_POSTGRESQL_DROP,
+)
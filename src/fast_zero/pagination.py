@@ -0,0 +1,42 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+# Cursor values are bound as SQL integers, which are 64-bit everywhere.
+CURSOR_MIN = -(2**63)
+CURSOR_MAX = 2**63 - 1
+
+
+def encode_cursor(*values: int) -> str:
+    key = ":".join(str(value) for value in values)
+    return urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> tuple[int, ...]:
+    try:
+        values = tuple(
+            int(value)
+            for value in urlsafe_b64decode(cursor.encode()).decode().split(":")
+        )
+    except (BinasciiError, UnicodeDecodeError, ValueError):
+        values = ()
+
+    if len(values) != size or not all(
+        CURSOR_MIN <= value <= CURSOR_MAX for value in values
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+    return values
+
+
+def paginate(rows: list, limit: int, key) -> tuple[list, str | None]:
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
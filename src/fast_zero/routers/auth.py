@@ -1,27 +1,104 @@
+import math
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+)
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from fast_zero.database import get_session
+from fast_zero.admission import get_login_admission
+from fast_zero.database import get_async_session, get_session
+from fast_zero.metrics import login_rejections
 from fast_zero.models import User
 from fast_zero.schemas import TokenSchema
 from fast_zero.security import (
+    AuthenticatedUser,
     create_access_token,
     get_current_user,
+    get_current_user_async,
+    password_needs_rehash,
+    upgrade_password_hash,
+    upgrade_password_hash_async,
     verify_password,
+    verify_password_async,
 )
+from fast_zero.settings import Settings, get_settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
+async_router = APIRouter(prefix="/auth", tags=["auth"])
 OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
+TSettings = Annotated[Settings, Depends(get_settings)]
 TSession = Annotated[Session, Depends(get_session)]
+TAsyncSession = Annotated[AsyncSession, Depends(get_async_session)]
+
+
+def incorrect_credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.UNAUTHORIZED,
+        detail="Incorrect email or password",
+    )
+
+
+def too_many_login_attempts_exception(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+        detail="Too many login attempts",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def reject_login(reason: str, retry_after: float):
+    login_rejections.inc(labels=(reason,))
+    raise too_many_login_attempts_exception(retry_after)
+
+
+# Route dependencies are solved before the handler's own parameters, so a
+# rejected attempt never opens a session or reaches the hasher. The client
+# address is whatever the server reports; trusting X-Forwarded-For is left
+# to the server's proxy-headers setting.
+async def admit_login(
+    request: Request,
+    form_data: OAuth2Form,
+    settings: TSettings,
+):
+    admission = get_login_admission()
+    client_ip = request.client.host if request.client else "unknown"
+    username = form_data.username.strip().lower()
+
+    if retry_after := admission.by_ip.acquire(client_ip):
+        reject_login("ip", retry_after)
+
+    if retry_after := admission.by_username.acquire(username):
+        reject_login("username", retry_after)
 
+    if not admission.concurrency.try_acquire():
+        reject_login("concurrency", settings.HASHING_RETRY_AFTER_SECONDS)
 
-@router.post("/token", response_model=TokenSchema)
-def login(session: TSession, form_data: OAuth2Form):
+    try:
+        yield
+    finally:
+        admission.concurrency.release()
+
+
+@router.post(
+    "/token",
+    response_model=TokenSchema,
+    dependencies=[Depends(admit_login)],
+)
+def login(
+    session: TSession,
+    form_data: OAuth2Form,
+    background_tasks: BackgroundTasks,
+    settings: TSettings,
+):
     db_user = session.scalar(
         select(User).where(User.email == form_data.username),
     )
@@ -30,13 +107,20 @@ def login(session: TSession, form_data: OAuth2Form):
         form_data.password,
         db_user.password,
     ):
-        raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Incorrect email or password",
+        raise incorrect_credentials_exception()
+
+    if password_needs_rehash(db_user.password):
+        background_tasks.add_task(
+            upgrade_password_hash,
+            session,
+            db_user.id,
+            form_data.password,
+            db_user.password,
         )
 
     access_token = create_access_token(
         data={"sub": db_user.email},
+        settings=settings,
     )
 
     return {"access_token": access_token, "token_type": "Bearer"}
@@ -44,7 +128,61 @@ def login(session: TSession, form_data: OAuth2Form):
 
 @router.get("/refresh_token", response_model=TokenSchema)
 def refresh_token(
-    user: User = Depends(get_current_user),
+    settings: TSettings,
+    user: AuthenticatedUser = Depends(get_current_user),
 ):
-    new_access_token = create_access_token(data={"sub": user.email})
+    new_access_token = create_access_token(
+        data={"sub": user.email},
+        settings=settings,
+    )
+    return {"access_token": new_access_token, "token_type": "Bearer"}
+
+
+@async_router.post(
+    "/token",
+    response_model=TokenSchema,
+    dependencies=[Depends(admit_login)],
+)
+async def login_async(
+    session: TAsyncSession,
+    form_data: OAuth2Form,
+    background_tasks: BackgroundTasks,
+    settings: TSettings,
+):
+    db_user = await session.scalar(
+        select(User).where(User.email == form_data.username),
+    )
+
+    if not db_user or not await verify_password_async(
+        form_data.password,
+        db_user.password,
+    ):
+        raise incorrect_credentials_exception()
+
+    if password_needs_rehash(db_user.password):
+        background_tasks.add_task(
+            upgrade_password_hash_async,
+            session,
+            db_user.id,
+            form_data.password,
+            db_user.password,
+        )
+
+    access_token = create_access_token(
+        data={"sub": db_user.email},
+        settings=settings,
+    )
+
+    return {"access_token": access_token, "token_type": "Bearer"}
+
+
+@async_router.get("/refresh_token", response_model=TokenSchema)
+async def refresh_token_async(
+    settings: TSettings,
+    user: AuthenticatedUser = Depends(get_current_user_async),
+):
+    new_access_token = create_access_token(
+        data={"sub": user.email},
+        settings=settings,
+    )
     return {"access_token": new_access_token, "token_type": "Bearer"}
@@ -1,52 +1,133 @@
 from http import HTTPStatus
+from operator import itemgetter
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from fast_zero.database import get_session
-from fast_zero.models import Todo, User
+from fast_zero.database import (
+    get_async_read_session,
+    get_async_session,
+    get_read_session,
+    get_session,
+)
+from fast_zero.etags import check_etag, revision_query
+from fast_zero.events import (
+    ChangeHistoryExpiredError,
+    broker,
+    stream_changes,
+    wait_for_changes,
+)
+from fast_zero.formats import (
+    MEDIA_TYPES,
+    DataFormat,
+    export_header,
+    export_todos_query,
+    import_batches,
+    serialize_rows,
+    validate_bulk,
+)
+from fast_zero.models import Todo, TodoCounter, TodoState
+from fast_zero.pagination import decode_cursor, paginate
+from fast_zero.responses import json_response, rows_as_dicts, todo_list_adapter
 from fast_zero.schemas import (
     FilterTodo,
     MessageSchema,
+    TodoBulkDeleteResultSchema,
+    TodoBulkDeleteSchema,
+    TodoBulkResultSchema,
+    TodoBulkSchema,
+    TodoBulkUpdateItemSchema,
+    TodoChangesSchema,
+    TodoImportResultSchema,
     TodoListSchema,
     TodoPublicSchema,
     TodoSchema,
+    TodoStatsSchema,
+    TodoUpdateSchema,
+)
+from fast_zero.search import apply_search
+from fast_zero.security import (
+    AuthenticatedUser,
+    get_current_user,
+    get_current_user_async,
 )
-from fast_zero.security import get_current_user
+from fast_zero.settings import Settings, get_settings
 
 router = APIRouter(prefix="/todos", tags=["todos"])
+async_router = APIRouter(prefix="/todos", tags=["todos"])
+TSettings = Annotated[Settings, Depends(get_settings)]
 TSession = Annotated[Session, Depends(get_session)]
-TCurrentUser = Annotated[User, Depends(get_current_user)]
+TAsyncSession = Annotated[AsyncSession, Depends(get_async_session)]
+TReadSession = Annotated[Session, Depends(get_read_session)]
+TAsyncReadSession = Annotated[
+    AsyncSession,
+    Depends(get_async_read_session),
+]
+TCurrentUser = Annotated[AuthenticatedUser, Depends(get_current_user)]
+TAsyncCurrentUser = Annotated[
+    AuthenticatedUser,
+    Depends(get_current_user_async),
+]
 
+BULK_CHUNK_SIZE = 500
+IMPORT_MAX_ERRORS = 100
+TODO_COLUMNS = (Todo.id, Todo.title, Todo.description, Todo.state)
+# The cursor is built from user_id; the serializer drops it from the body.
+TODO_LIST_COLUMNS = (*TODO_COLUMNS, Todo.user_id)
 
-@router.post("/", response_model=TodoPublicSchema)
-def create_todo(
-    todo: TodoSchema,
-    user: TCurrentUser,
-    session: TSession,
+
+# The revision is read before the rows, so a write racing the request can
+# only make the ETag older than the data it labels, never newer.
+def check_todos_etag(
+    request: Request,
+    response: Response,
+    session: TReadSession,
+    current_user: TCurrentUser,
 ):
-    db_todo = Todo(
-        title=todo.title,
-        description=todo.description,
-        state=todo.state,
-        user_id=user.id,
-    )
+    key = f"todos:{current_user.id}"
+    check_etag(request, response, key, session.scalar(revision_query(key)))
 
-    session.add(db_todo)
-    session.commit()
-    session.refresh(db_todo)
-    return db_todo
 
+async def check_todos_etag_async(
+    request: Request,
+    response: Response,
+    session: TAsyncReadSession,
+    current_user: TAsyncCurrentUser,
+):
+    key = f"todos:{current_user.id}"
+    version = await session.scalar(revision_query(key))
+    check_etag(request, response, key, version)
 
-@router.get("/", response_model=TodoListSchema)
-def list_todos(
-    session: TSession,
-    current_user: TCurrentUser,
-    todo_filter: Annotated[FilterTodo, Query()],
+
+def list_todos_query(
+    user_id: int,
+    todo_filter: FilterTodo,
+    dialect: str,
+    columns=(Todo,),
 ):
-    query = select(Todo).where(Todo.user_id == current_user.id)
+    query = select(*columns).where(Todo.user_id == user_id)
+
+    if todo_filter.search:
+        if todo_filter.cursor:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail="Cursor pagination is not available for searches",
+            )
+
+        query = apply_search(query, todo_filter.search, dialect)
 
     if todo_filter.title:
         query = query.where(Todo.title.contains(todo_filter.title))
@@ -59,11 +140,423 @@ def list_todos(
     if todo_filter.state:
         query = query.where(Todo.state == todo_filter.state)
 
+    if todo_filter.cursor:
+        cursor_user_id, cursor_id = decode_cursor(todo_filter.cursor, 2)
+
+        if cursor_user_id != user_id:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+        query = query.where(Todo.id > cursor_id)
+    else:
+        query = query.offset(todo_filter.offset)
+
+    # One extra row tells whether there is a next page.
+    return query.order_by(Todo.id).limit(todo_filter.limit + 1)
+
+
+def todo_page(db_todos: list[Todo], todo_filter: FilterTodo) -> dict:
+    db_todos, next_cursor = paginate(
+        db_todos,
+        todo_filter.limit,
+        key=lambda todo: (todo.user_id, todo.id),
+    )
+
+    # Search results are ordered by rank, so an id cursor cannot resume them.
+    if todo_filter.search:
+        next_cursor = None
+
+    return {"todos": db_todos, "next_cursor": next_cursor}
+
+
+def todo_stats_query(user_id: int):
+    return select(TodoCounter.state, TodoCounter.count).where(
+        TodoCounter.user_id == user_id,
+    )
+
+
+def todo_stats(rows) -> dict:
+    counts = dict.fromkeys(TodoState, 0)
+    counts.update(rows)
+    return {"counts": counts, "total": sum(counts.values())}
+
+
+def insert_todo_statement(todo: TodoSchema, user_id: int):
+    return (
+        insert(Todo)
+        .values(**todo.model_dump(), user_id=user_id)
+        .returning(*TODO_COLUMNS)
+    )
+
+
+def update_todo_statement(user_id: int, todo_id: int, values: dict):
+    return (
+        update(Todo)
+        .where(Todo.user_id == user_id, Todo.id == todo_id)
+        .values(**values)
+        .returning(*TODO_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_todo_statement(user_id: int, todo_id: int):
+    return (
+        delete(Todo)
+        .where(Todo.user_id == user_id, Todo.id == todo_id)
+        .returning(Todo.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def patch_todo_statement(user_id: int, todo_id: int, values: dict):
+    if not values:
+        return select_todos_query(user_id, [todo_id])
+
+    return update_todo_statement(user_id, todo_id, values)
+
+
+def ensure_todo_found(db_todo):
+    if db_todo is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Task not found.",
+        )
+
+    return db_todo
+
+
+def chunked(values: list, size: int = BULK_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def not_found_errors(indexed_ids, found_ids: set[int]) -> list[dict]:
+    return [
+        {"index": index, "detail": "Task not found."}
+        for index, todo_id in indexed_ids
+        if todo_id not in found_ids
+    ]
+
+
+def import_result(accepted: int, rejected: int, errors: list[dict]) -> dict:
+    return {"accepted": accepted, "rejected": rejected, "errors": errors}
+
+
+def bulk_result(rows, errors: list[dict], key: str = "todos") -> dict:
+    return {key: rows, "errors": sorted(errors, key=itemgetter("index"))}
+
+
+def bulk_insert_statement():
+    return insert(Todo).returning(*TODO_COLUMNS)
+
+
+# SQLite does not promise RETURNING order, so sort_by_parameter_order made
+# SQLAlchemy fall back to one INSERT per row there. Ids are assigned in
+# VALUES order, so sorting the batched rows by id restores input order.
+def inserted_rows(result) -> list:
+    return sorted(result.mappings().all(), key=itemgetter("id"))
+
+
+def bulk_insert_params(todos, user_id: int) -> list[dict]:
+    return [{**todo.model_dump(), "user_id": user_id} for _, todo in todos]
+
+
+def owned_todo_ids_query(user_id: int, todo_ids: list[int]):
+    return select(Todo.id).where(
+        Todo.user_id == user_id,
+        Todo.id.in_(todo_ids),
+    )
+
+
+def bulk_update_params(todos, owned_ids: set[int]) -> list[dict]:
+    params = []
+
+    for _, todo in todos:
+        values = todo.model_dump(exclude={"id"}, exclude_none=True)
+
+        if todo.id in owned_ids and values:
+            params.append({"id": todo.id, **values})
+
+    return params
+
+
+# Items that only name an id, or only send nulls, change nothing and so are
+# neither returned nor published as updated.
+def updated_todo_ids(params: list[dict]) -> list[int]:
+    return sorted({values["id"] for values in params})
+
+
+def select_todos_query(user_id: int, todo_ids: list[int]):
+    return (
+        select(*TODO_COLUMNS)
+        .where(Todo.user_id == user_id, Todo.id.in_(todo_ids))
+        .order_by(Todo.id)
+    )
+
+
+def publish_todos(user_id: int, type_: str, rows):
+    if rows:
+        broker.publish(user_id, type_, {"todos": [dict(row) for row in rows]})
+
+
+def publish_deleted(user_id: int, todo_ids: list[int]):
+    if todo_ids:
+        broker.publish(user_id, "deleted", {"ids": todo_ids})
+
+
+def last_event_id(request: Request) -> str | None:
+    return request.headers.get("last-event-id") or None
+
+
+async def changes_response(
+    request: Request,
+    user_id: int,
+    since: str | None,
+    settings: Settings,
+):
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            stream_changes(
+                user_id,
+                last_event_id(request) if since is None else since,
+                settings.CHANGES_HEARTBEAT_SECONDS,
+            ),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    try:
+        return await wait_for_changes(
+            user_id,
+            since,
+            settings.CHANGES_LONG_POLL_SECONDS,
+        )
+    except ChangeHistoryExpiredError:
+        raise HTTPException(
+            status_code=HTTPStatus.GONE,
+            detail="Change history is no longer available",
+        )
+
+
+def export_response(chunks, data_format: DataFormat) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[data_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="todos.{data_format.value}"'
+            ),
+        },
+    )
+
+
+def bulk_delete_statement(user_id: int, todo_ids: list[int]):
+    return (
+        delete(Todo)
+        .where(Todo.user_id == user_id, Todo.id.in_(todo_ids))
+        .returning(Todo.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@router.post("/", response_model=TodoPublicSchema)
+def create_todo(
+    todo: TodoSchema,
+    user: TCurrentUser,
+    session: TSession,
+):
+    row = session.execute(insert_todo_statement(todo, user.id)).one()
+    session.commit()
+    publish_todos(user.id, "created", [row._asdict()])
+    return row._asdict()
+
+
+@router.get(
+    "/",
+    response_model=TodoListSchema,
+    dependencies=[Depends(check_todos_etag)],
+)
+def list_todos(
+    session: TReadSession,
+    current_user: TCurrentUser,
+    todo_filter: Annotated[FilterTodo, Query()],
+    response: Response,
+    settings: TSettings,
+):
+    dialect = session.get_bind().dialect.name
+
+    if settings.FAST_JSON_LISTS:
+        rows = session.execute(
+            list_todos_query(
+                current_user.id,
+                todo_filter,
+                dialect,
+                TODO_LIST_COLUMNS,
+            ),
+        ).all()
+        page = rows_as_dicts(todo_page(rows, todo_filter), "todos")
+        return json_response(todo_list_adapter, page, response)
+
     db_todos = session.scalars(
-        query.offset(todo_filter.offset).limit(todo_filter.limit)
+        list_todos_query(current_user.id, todo_filter, dialect),
     ).all()
 
-    return {"todos": db_todos}
+    return todo_page(db_todos, todo_filter)
+
+
+@router.get("/stats", response_model=TodoStatsSchema)
+def read_todo_stats(session: TReadSession, current_user: TCurrentUser):
+    return todo_stats(
+        session.execute(todo_stats_query(current_user.id)).all(),
+    )
+
+
+@router.get("/changes", response_model=TodoChangesSchema)
+async def read_todo_changes(
+    request: Request,
+    session: TReadSession,
+    current_user: TCurrentUser,
+    settings: TSettings,
+    since: str | None = None,
+):
+    # Waiting feeds must not pin a pooled connection.
+    await run_in_threadpool(session.close)
+    return await changes_response(request, current_user.id, since, settings)
+
+
+@router.get("/export")
+def export_todos(
+    session: TReadSession,
+    current_user: TCurrentUser,
+    data_format: Annotated[DataFormat, Query(alias="format")] = (
+        DataFormat.ndjson
+    ),
+):
+    # The request session is closed before the body is streamed, so the
+    # generator runs its own transaction on it and closes it when done.
+    def chunks():
+        try:
+            yield export_header(data_format)
+            result = session.execute(export_todos_query(current_user.id))
+
+            for rows in result.partitions():
+                yield serialize_rows(rows, data_format)
+        finally:
+            session.close()
+
+    return export_response(chunks(), data_format)
+
+
+@router.post("/import", response_model=TodoImportResultSchema)
+def import_todos(
+    file: UploadFile,
+    session: TSession,
+    current_user: TCurrentUser,
+    data_format: Annotated[DataFormat, Query(alias="format")] = (
+        DataFormat.ndjson
+    ),
+):
+    accepted, rejected, errors = 0, 0, []
+
+    for params, batch_errors in import_batches(
+        file.file,
+        data_format,
+        current_user.id,
+    ):
+        if params:
+            session.execute(insert(Todo), params)
+            session.commit()
+
+        accepted += len(params)
+        rejected += len(batch_errors)
+        errors += batch_errors[: IMPORT_MAX_ERRORS - len(errors)]
+
+    if accepted:
+        broker.publish(current_user.id, "imported", {"count": accepted})
+
+    return import_result(accepted, rejected, errors)
+
+
+@router.post("/bulk", response_model=TodoBulkResultSchema)
+def create_todos_bulk(
+    payload: TodoBulkSchema,
+    user: TCurrentUser,
+    session: TSession,
+):
+    todos, errors = validate_bulk(payload.todos, TodoSchema)
+    rows = []
+
+    if todos:
+        rows = inserted_rows(
+            session.execute(
+                bulk_insert_statement(),
+                bulk_insert_params(todos, user.id),
+            ),
+        )
+        session.commit()
+        publish_todos(user.id, "created", rows)
+
+    return bulk_result(rows, errors)
+
+
+@router.patch("/bulk", response_model=TodoBulkResultSchema)
+def update_todos_bulk(
+    payload: TodoBulkSchema,
+    session: TSession,
+    current_user: TCurrentUser,
+):
+    todos, errors = validate_bulk(payload.todos, TodoBulkUpdateItemSchema)
+    todo_ids = [todo.id for _, todo in todos]
+    owned_ids = {
+        todo_id
+        for chunk in chunked(todo_ids)
+        for todo_id in session.scalars(
+            owned_todo_ids_query(current_user.id, chunk),
+        )
+    }
+    errors += not_found_errors(
+        ((index, todo.id) for index, todo in todos),
+        owned_ids,
+    )
+
+    params = bulk_update_params(todos, owned_ids)
+    if params:
+        session.execute(update(Todo), params)
+
+    session.commit()
+
+    rows = [
+        row
+        for chunk in chunked(updated_todo_ids(params))
+        for row in session.execute(
+            select_todos_query(current_user.id, chunk),
+        ).mappings()
+    ]
+    publish_todos(current_user.id, "updated", rows)
+    return bulk_result(rows, errors)
+
+
+@router.delete("/bulk", response_model=TodoBulkDeleteResultSchema)
+def delete_todos_bulk(
+    payload: TodoBulkDeleteSchema,
+    session: TSession,
+    current_user: TCurrentUser,
+):
+    deleted = [
+        todo_id
+        for chunk in chunked(payload.ids)
+        for todo_id in session.scalars(
+            bulk_delete_statement(current_user.id, chunk),
+        )
+    ]
+    session.commit()
+
+    publish_deleted(current_user.id, sorted(deleted))
+
+    errors = not_found_errors(enumerate(payload.ids), set(deleted))
+    return bulk_result(sorted(deleted), errors, key="deleted")
 
 
 @router.put("/{todo_id}", response_model=TodoPublicSchema)
@@ -73,27 +566,34 @@ def update_todo(
     session: TSession,
     current_user: TCurrentUser,
 ):
-    db_todo = session.scalar(
-        select(Todo).where(
-            Todo.user_id == current_user.id,
-            Todo.id == todo_id,
-        )
+    result = session.execute(
+        update_todo_statement(current_user.id, todo_id, todo.model_dump()),
     )
+    row = ensure_todo_found(result.one_or_none())
+    session.commit()
+    publish_todos(current_user.id, "updated", [row._asdict()])
 
-    if not db_todo:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND,
-            detail="Task not found.",
-        )
+    return row._asdict()
 
-    for key, value in todo.model_dump(exclude_unset=True).items():
-        setattr(db_todo, key, value)
 
-    session.add(db_todo)
+@router.patch("/{todo_id}", response_model=TodoPublicSchema)
+def patch_todo(
+    todo_id: int,
+    todo: TodoUpdateSchema,
+    session: TSession,
+    current_user: TCurrentUser,
+):
+    values = todo.model_dump(exclude_unset=True, exclude_none=True)
+    result = session.execute(
+        patch_todo_statement(current_user.id, todo_id, values),
+    )
+    row = ensure_todo_found(result.one_or_none())
     session.commit()
-    session.refresh(db_todo)
 
-    return db_todo
+    if values:
+        publish_todos(current_user.id, "updated", [row._asdict()])
+
+    return row._asdict()
 
 
 @router.delete("/{todo_id}", response_model=MessageSchema)
@@ -102,19 +602,258 @@ def delete_todo(
     session: TSession,
     current_user: TCurrentUser,
 ):
-    db_todo = session.scalar(
-        select(Todo).where(
-            Todo.user_id == current_user.id,
-            Todo.id == todo_id,
+    ensure_todo_found(
+        session.scalar(delete_todo_statement(current_user.id, todo_id)),
+    )
+    session.commit()
+    publish_deleted(current_user.id, [todo_id])
+    return {"message": "Task has been deleted successfully."}
+
+
+@async_router.post("/", response_model=TodoPublicSchema)
+async def create_todo_async(
+    todo: TodoSchema,
+    user: TAsyncCurrentUser,
+    session: TAsyncSession,
+):
+    row = (await session.execute(insert_todo_statement(todo, user.id))).one()
+    await session.commit()
+    publish_todos(user.id, "created", [row._asdict()])
+    return row._asdict()
+
+
+@async_router.get(
+    "/",
+    response_model=TodoListSchema,
+    dependencies=[Depends(check_todos_etag_async)],
+)
+async def list_todos_async(
+    session: TAsyncReadSession,
+    current_user: TAsyncCurrentUser,
+    todo_filter: Annotated[FilterTodo, Query()],
+    response: Response,
+    settings: TSettings,
+):
+    dialect = session.get_bind().dialect.name
+
+    if settings.FAST_JSON_LISTS:
+        rows = await session.execute(
+            list_todos_query(
+                current_user.id,
+                todo_filter,
+                dialect,
+                TODO_LIST_COLUMNS,
+            ),
+        )
+        page = rows_as_dicts(todo_page(rows.all(), todo_filter), "todos")
+        return json_response(todo_list_adapter, page, response)
+
+    db_todos = await session.scalars(
+        list_todos_query(current_user.id, todo_filter, dialect),
+    )
+
+    return todo_page(db_todos.all(), todo_filter)
+
+
+@async_router.get("/stats", response_model=TodoStatsSchema)
+async def read_todo_stats_async(
+    session: TAsyncReadSession,
+    current_user: TAsyncCurrentUser,
+):
+    result = await session.execute(todo_stats_query(current_user.id))
+    return todo_stats(result.all())
+
+
+@async_router.get("/changes", response_model=TodoChangesSchema)
+async def read_todo_changes_async(
+    request: Request,
+    session: TAsyncReadSession,
+    current_user: TAsyncCurrentUser,
+    settings: TSettings,
+    since: str | None = None,
+):
+    await session.close()
+    return await changes_response(request, current_user.id, since, settings)
+
+
+@async_router.get("/export")
+async def export_todos_async(
+    session: TAsyncReadSession,
+    current_user: TAsyncCurrentUser,
+    data_format: Annotated[DataFormat, Query(alias="format")] = (
+        DataFormat.ndjson
+    ),
+):
+    async def chunks():
+        try:
+            yield export_header(data_format)
+            result = await session.stream(export_todos_query(current_user.id))
+
+            async for rows in result.partitions():
+                yield serialize_rows(rows, data_format)
+        finally:
+            await session.close()
+
+    return export_response(chunks(), data_format)
+
+
+@async_router.post("/import", response_model=TodoImportResultSchema)
+async def import_todos_async(
+    file: UploadFile,
+    session: TAsyncSession,
+    current_user: TAsyncCurrentUser,
+    data_format: Annotated[DataFormat, Query(alias="format")] = (
+        DataFormat.ndjson
+    ),
+):
+    accepted, rejected, errors = 0, 0, []
+    batches = import_batches(file.file, data_format, current_user.id)
+
+    # Reading and validating the upload blocks, so it runs off the loop.
+    while batch := await run_in_threadpool(next, batches, None):
+        params, batch_errors = batch
+
+        if params:
+            await session.execute(insert(Todo), params)
+            await session.commit()
+
+        accepted += len(params)
+        rejected += len(batch_errors)
+        errors += batch_errors[: IMPORT_MAX_ERRORS - len(errors)]
+
+    if accepted:
+        broker.publish(current_user.id, "imported", {"count": accepted})
+
+    return import_result(accepted, rejected, errors)
+
+
+@async_router.post("/bulk", response_model=TodoBulkResultSchema)
+async def create_todos_bulk_async(
+    payload: TodoBulkSchema,
+    user: TAsyncCurrentUser,
+    session: TAsyncSession,
+):
+    todos, errors = validate_bulk(payload.todos, TodoSchema)
+    rows = []
+
+    if todos:
+        result = await session.execute(
+            bulk_insert_statement(),
+            bulk_insert_params(todos, user.id),
+        )
+        rows = inserted_rows(result)
+        await session.commit()
+        publish_todos(user.id, "created", rows)
+
+    return bulk_result(rows, errors)
+
+
+@async_router.patch("/bulk", response_model=TodoBulkResultSchema)
+async def update_todos_bulk_async(
+    payload: TodoBulkSchema,
+    session: TAsyncSession,
+    current_user: TAsyncCurrentUser,
+):
+    todos, errors = validate_bulk(payload.todos, TodoBulkUpdateItemSchema)
+    todo_ids = [todo.id for _, todo in todos]
+    owned_ids = set()
+
+    for chunk in chunked(todo_ids):
+        owned_ids.update(
+            await session.scalars(
+                owned_todo_ids_query(current_user.id, chunk),
+            )
         )
+
+    errors += not_found_errors(
+        ((index, todo.id) for index, todo in todos),
+        owned_ids,
     )
 
-    if not db_todo:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND,
-            detail="Task not found.",
+    params = bulk_update_params(todos, owned_ids)
+    if params:
+        await session.execute(update(Todo), params)
+
+    await session.commit()
+
+    rows = []
+    for chunk in chunked(updated_todo_ids(params)):
+        result = await session.execute(
+            select_todos_query(current_user.id, chunk),
         )
+        rows += result.mappings().all()
 
-    session.delete(db_todo)
-    session.commit()
+    publish_todos(current_user.id, "updated", rows)
+    return bulk_result(rows, errors)
+
+
+@async_router.delete("/bulk", response_model=TodoBulkDeleteResultSchema)
+async def delete_todos_bulk_async(
+    payload: TodoBulkDeleteSchema,
+    session: TAsyncSession,
+    current_user: TAsyncCurrentUser,
+):
+    deleted = []
+
+    for chunk in chunked(payload.ids):
+        deleted += await session.scalars(
+            bulk_delete_statement(current_user.id, chunk),
+        )
+
+    await session.commit()
+
+    publish_deleted(current_user.id, sorted(deleted))
+
+    errors = not_found_errors(enumerate(payload.ids), set(deleted))
+    return bulk_result(sorted(deleted), errors, key="deleted")
+
+
+@async_router.put("/{todo_id}", response_model=TodoPublicSchema)
+async def update_todo_async(
+    todo_id: int,
+    todo: TodoSchema,
+    session: TAsyncSession,
+    current_user: TAsyncCurrentUser,
+):
+    result = await session.execute(
+        update_todo_statement(current_user.id, todo_id, todo.model_dump()),
+    )
+    row = ensure_todo_found(result.one_or_none())
+    await session.commit()
+    publish_todos(current_user.id, "updated", [row._asdict()])
+
+    return row._asdict()
+
+
+@async_router.patch("/{todo_id}", response_model=TodoPublicSchema)
+async def patch_todo_async(
+    todo_id: int,
+    todo: TodoUpdateSchema,
+    session: TAsyncSession,
+    current_user: TAsyncCurrentUser,
+):
+    values = todo.model_dump(exclude_unset=True, exclude_none=True)
+    result = await session.execute(
+        patch_todo_statement(current_user.id, todo_id, values),
+    )
+    row = ensure_todo_found(result.one_or_none())
+    await session.commit()
+
+    if values:
+        publish_todos(current_user.id, "updated", [row._asdict()])
+
+    return row._asdict()
+
+
+@async_router.delete("/{todo_id}", response_model=MessageSchema)
+async def delete_todo_async(
+    todo_id: int,
+    session: TAsyncSession,
+    current_user: TAsyncCurrentUser,
+):
+    ensure_todo_found(
+        await session.scalar(delete_todo_statement(current_user.id, todo_id)),
+    )
+    await session.commit()
+    publish_deleted(current_user.id, [todo_id])
     return {"message": "Task has been deleted successfully."}
@@ -1,32 +1,82 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from fast_zero.database import get_session
+from fast_zero.database import (
+    get_async_read_session,
+    get_async_session,
+    get_read_session,
+    get_session,
+)
+from fast_zero.etags import check_etag, revision_query
 from fast_zero.models import User
-from fast_zero.schemas import UserListSchema, UserPublicSchema, UserSchema
-from fast_zero.security import get_current_user, get_password_hash
+from fast_zero.pagination import decode_cursor, paginate
+from fast_zero.responses import json_response, rows_as_dicts, user_list_adapter
+from fast_zero.schemas import (
+    FilterUser,
+    UserListSchema,
+    UserPublicSchema,
+    UserSchema,
+)
+from fast_zero.security import (
+    AuthenticatedUser,
+    get_current_user,
+    get_current_user_async,
+    get_password_hash,
+    get_password_hash_async,
+    invalidate_user,
+)
+from fast_zero.settings import Settings, get_settings
 
 router = APIRouter(prefix="/users", tags=["users"])
+async_router = APIRouter(prefix="/users", tags=["users"])
+TSettings = Annotated[Settings, Depends(get_settings)]
 TSession = Annotated[Session, Depends(get_session)]
-TCurrentUser = Annotated[User, Depends(get_current_user)]
+TAsyncSession = Annotated[AsyncSession, Depends(get_async_session)]
+TReadSession = Annotated[Session, Depends(get_read_session)]
+TAsyncReadSession = Annotated[
+    AsyncSession,
+    Depends(get_async_read_session),
+]
+TCurrentUser = Annotated[AuthenticatedUser, Depends(get_current_user)]
+TAsyncCurrentUser = Annotated[
+    AuthenticatedUser,
+    Depends(get_current_user_async),
+]
 
+USER_LIST_COLUMNS = (User.id, User.username, User.email)
+
+
+def check_users_etag(
+    request: Request,
+    response: Response,
+    session: TReadSession,
+):
+    version = session.scalar(revision_query("users"))
+    check_etag(request, response, "users", version)
 
-@router.post(
-    "/",
-    status_code=HTTPStatus.CREATED,
-    response_model=UserPublicSchema,
-)
-def create_user(user: UserSchema, session: TSession):
-    db_user = session.scalar(
-        select(User).where(
-            (User.username == user.username) | (User.email == user.email),
-        ),
-    )
 
+async def check_users_etag_async(
+    request: Request,
+    response: Response,
+    session: TAsyncReadSession,
+):
+    version = await session.scalar(revision_query("users"))
+    check_etag(request, response, "users", version)
+
+
+def ensure_user_is_unique(db_user: User | None, user: UserSchema):
     if db_user:
         if db_user.username == user.username:
             raise HTTPException(
@@ -40,30 +90,118 @@ def create_user(user: UserSchema, session: TSession):
                 detail="Email already exists",
             )
 
-    db_user = User(**user.model_dump())
-    db_user.password = get_password_hash(user.password)
 
-    session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+def ensure_is_current_user(current_user: AuthenticatedUser, user_id: int):
+    if current_user.id != user_id:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN,
+            detail="You do not have permission to update this user",
+        )
+
+
+def ensure_user_found(db_user):
+    if not db_user:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="User not found",
+        )
 
     return db_user
 
 
+def read_users_query(user_filter: FilterUser, columns=(User,)):
+    query = select(*columns)
+
+    if user_filter.cursor:
+        (cursor_id,) = decode_cursor(user_filter.cursor, 1)
+        query = query.where(User.id > cursor_id)
+    else:
+        query = query.offset(user_filter.skip)
+
+    return query.order_by(User.id).limit(user_filter.limit + 1)
+
+
+def user_page(db_users: list[User], limit: int) -> dict:
+    db_users, next_cursor = paginate(
+        db_users,
+        limit,
+        key=lambda user: (user.id,),
+    )
+    return {"users": db_users, "next_cursor": next_cursor}
+
+
+def insert_user_statement(user: UserSchema, password_hash: str):
+    return (
+        insert(User)
+        .values(
+            username=user.username,
+            email=user.email,
+            password=password_hash,
+        )
+        .returning(User.id, User.username, User.email)
+    )
+
+
+def update_user_statement(user_id: int, user: UserSchema, password_hash: str):
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            username=user.username,
+            email=user.email,
+            password=password_hash,
+        )
+        .returning(User.id, User.username, User.email)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_conflicting_user_query(user: UserSchema):
+    return select(User).where(
+        (User.username == user.username) | (User.email == user.email),
+    )
+
+
+@router.post(
+    "/",
+    status_code=HTTPStatus.CREATED,
+    response_model=UserPublicSchema,
+)
+def create_user(user: UserSchema, session: TSession):
+    ensure_user_is_unique(
+        session.scalar(find_conflicting_user_query(user)),
+        user,
+    )
+
+    row = session.execute(
+        insert_user_statement(user, get_password_hash(user.password)),
+    ).one()
+    session.commit()
+
+    return row._asdict()
+
+
 @router.get(
     "/",
     status_code=HTTPStatus.OK,
     response_model=UserListSchema,
+    dependencies=[Depends(check_users_etag)],
 )
 def read_users(
-    session: TSession,
-    limit: int = 10,
-    skip: int = 0,
+    session: TReadSession,
+    user_filter: Annotated[FilterUser, Query()],
+    response: Response,
+    settings: TSettings,
 ):
-    db_users = session.scalars(
-        select(User).limit(limit).offset(skip),
-    )
-    return {"users": db_users}
+    if settings.FAST_JSON_LISTS:
+        rows = session.execute(
+            read_users_query(user_filter, USER_LIST_COLUMNS),
+        ).all()
+        page = rows_as_dicts(user_page(rows, user_filter.limit), "users")
+        return json_response(user_list_adapter, page, response)
+
+    db_users = session.scalars(read_users_query(user_filter)).all()
+    return user_page(db_users, user_filter.limit)
 
 
 @router.put(
@@ -77,21 +215,18 @@ def update_user(
     user: UserSchema,
     current_user: TCurrentUser,
 ):
-    if current_user.id != user_id:
-        raise HTTPException(
-            status_code=HTTPStatus.FORBIDDEN,
-            detail="You do not have permission to update this user",
-        )
+    ensure_is_current_user(current_user, user_id)
 
-    current_user.username = user.username
-    current_user.email = user.email
-    current_user.password = get_password_hash(user.password)
-
-    session.add(current_user)
+    password_hash = get_password_hash(user.password)
+    row = ensure_user_found(
+        session.execute(
+            update_user_statement(user_id, user, password_hash),
+        ).one_or_none(),
+    )
     session.commit()
-    session.refresh(current_user)
+    invalidate_user(current_user.email)
 
-    return current_user
+    return row._asdict()
 
 
 @router.delete("/{user_id}", status_code=HTTPStatus.NO_CONTENT)
@@ -100,11 +235,88 @@ def delete_user(
     user_id: int,
     current_user: TCurrentUser,
 ):
-    if current_user.id != user_id:
-        raise HTTPException(
-            status_code=HTTPStatus.FORBIDDEN,
-            detail="You do not have permission to update this user",
-        )
+    ensure_is_current_user(current_user, user_id)
 
-    session.delete(current_user)
+    session.delete(ensure_user_found(session.get(User, user_id)))
     session.commit()
+    invalidate_user(current_user.email)
+
+
+@async_router.post(
+    "/",
+    status_code=HTTPStatus.CREATED,
+    response_model=UserPublicSchema,
+)
+async def create_user_async(user: UserSchema, session: TAsyncSession):
+    ensure_user_is_unique(
+        await session.scalar(find_conflicting_user_query(user)),
+        user,
+    )
+
+    password_hash = await get_password_hash_async(user.password)
+    row = (
+        await session.execute(insert_user_statement(user, password_hash))
+    ).one()
+    await session.commit()
+
+    return row._asdict()
+
+
+@async_router.get(
+    "/",
+    status_code=HTTPStatus.OK,
+    response_model=UserListSchema,
+    dependencies=[Depends(check_users_etag_async)],
+)
+async def read_users_async(
+    session: TAsyncReadSession,
+    user_filter: Annotated[FilterUser, Query()],
+    response: Response,
+    settings: TSettings,
+):
+    if settings.FAST_JSON_LISTS:
+        rows = await session.execute(
+            read_users_query(user_filter, USER_LIST_COLUMNS),
+        )
+        page = rows_as_dicts(user_page(rows.all(), user_filter.limit), "users")
+        return json_response(user_list_adapter, page, response)
+
+    db_users = await session.scalars(read_users_query(user_filter))
+    return user_page(db_users.all(), user_filter.limit)
+
+
+@async_router.put(
+    "/{user_id}",
+    status_code=HTTPStatus.OK,
+    response_model=UserPublicSchema,
+)
+async def update_user_async(
+    session: TAsyncSession,
+    user_id: int,
+    user: UserSchema,
+    current_user: TAsyncCurrentUser,
+):
+    ensure_is_current_user(current_user, user_id)
+
+    password_hash = await get_password_hash_async(user.password)
+    result = await session.execute(
+        update_user_statement(user_id, user, password_hash),
+    )
+    row = ensure_user_found(result.one_or_none())
+    await session.commit()
+    invalidate_user(current_user.email)
+
+    return row._asdict()
+
+
+@async_router.delete("/{user_id}", status_code=HTTPStatus.NO_CONTENT)
+async def delete_user_async(
+    session: TAsyncSession,
+    user_id: int,
+    current_user: TAsyncCurrentUser,
+):
+    ensure_is_current_user(current_user, user_id)
+
+    await session.delete(ensure_user_found(await session.get(User, user_id)))
+    await session.commit()
+    invalidate_user(current_user.email)
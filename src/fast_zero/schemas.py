@@ -1,7 +1,12 @@
-from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing_extensions import TypedDict
 
 from fast_zero.models import TodoState
 
+MAX_PAGE_LIMIT = 1000
+
 
 class MessageSchema(BaseModel):
     message: str
@@ -24,6 +29,24 @@ class UserPublicSchema(BaseModel):
 
 class UserListSchema(BaseModel):
     users: list[UserPublicSchema]
+    next_cursor: str | None = None
+
+
+class UserPublicRow(TypedDict):
+    id: int
+    username: str
+    email: str
+
+
+class UserListPage(TypedDict):
+    users: list[UserPublicRow]
+    next_cursor: str | None
+
+
+class FilterUser(BaseModel):
+    limit: int = Field(10, ge=1, le=MAX_PAGE_LIMIT)
+    skip: int = 0
+    cursor: str | None = None
 
 
 class TokenSchema(BaseModel):
@@ -33,7 +56,8 @@ class TokenSchema(BaseModel):
 
 class FilterPage(BaseModel):
     offset: int = 0
-    limit: int = 100
+    limit: int = Field(100, ge=1, le=MAX_PAGE_LIMIT)
+    cursor: str | None = None
 
 
 class TodoSchema(BaseModel):
@@ -54,13 +78,76 @@ class TodoPublicSchema(TodoSchema):
 
 class TodoListSchema(BaseModel):
     todos: list[TodoPublicSchema]
+    next_cursor: str | None = None
 
     model_config = ConfigDict(
         from_attributes=True,
     )
 
 
+class TodoPublicRow(TypedDict):
+    id: int
+    title: str
+    description: str
+    state: TodoState
+
+
+class TodoListPage(TypedDict):
+    todos: list[TodoPublicRow]
+    next_cursor: str | None
+
+
 class FilterTodo(FilterPage):
+    search: str | None = None
     title: str | None = None
     description: str | None = None
     state: TodoState | None = None
+
+
+class TodoBulkSchema(BaseModel):
+    todos: list[dict[str, Any]]
+
+
+class TodoBulkUpdateItemSchema(TodoUpdateSchema):
+    id: int
+
+
+class TodoBulkDeleteSchema(BaseModel):
+    ids: list[int]
+
+
+class BulkItemErrorSchema(BaseModel):
+    index: int
+    detail: str
+
+
+class TodoBulkResultSchema(BaseModel):
+    todos: list[TodoPublicSchema]
+    errors: list[BulkItemErrorSchema]
+
+
+class TodoBulkDeleteResultSchema(BaseModel):
+    deleted: list[int]
+    errors: list[BulkItemErrorSchema]
+
+
+class TodoImportResultSchema(BaseModel):
+    accepted: int
+    rejected: int
+    errors: list[BulkItemErrorSchema]
+
+
+class TodoStatsSchema(BaseModel):
+    counts: dict[TodoState, int]
+    total: int
+
+
+class ChangeEventSchema(BaseModel):
+    revision: str
+    type: str
+    data: dict[str, Any]
+
+
+class TodoChangesSchema(BaseModel):
+    revision: str
+    events: list[ChangeEventSchema]
@@ -0,0 +1,38 @@
+import re
+
+from sqlalchemy import column, false, func, literal_column, table
+
+from fast_zero.models import Todo
+
+todos_fts = table("todos_fts", column("rowid"), column("rank"))
+
+
+def fts5_query(text: str) -> str:
+    # Quote every term so user input can never be parsed as FTS5 syntax,
+    # and match prefixes so partial words still find their todos.
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", text))
+
+
+def apply_search(query, text: str, dialect_name: str):
+    if dialect_name == "sqlite":
+        match = fts5_query(text)
+
+        if not match:
+            return query.where(false())
+
+        return (
+            query.join(todos_fts, todos_fts.c.rowid == Todo.id)
+            .where(literal_column("todos_fts").match(match))
+            .order_by(todos_fts.c.rank)
+        )
+
+    if dialect_name == "postgresql":
+        search_vector = literal_column("todos.search_vector")
+        tsquery = func.websearch_to_tsquery("simple", text)
+        return query.where(search_vector.op("@@")(tsquery)).order_by(
+            func.ts_rank(search_vector, tsquery).desc(),
+        )
+
+    return query.where(
+        Todo.title.contains(text) | Todo.description.contains(text),
+    )
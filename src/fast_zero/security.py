@@ -1,4 +1,7 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
+from hashlib import sha256
 from http import HTTPStatus
 from zoneinfo import ZoneInfo
 
@@ -7,74 +10,311 @@ from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, decode, encode
 from jwt.exceptions import ExpiredSignatureError
 from pwdlib import PasswordHash
-from sqlalchemy import select
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from fast_zero.database import get_session
+from fast_zero.cache import TTLCache
+from fast_zero.database import (
+    get_async_read_session,
+    get_async_session,
+    get_read_session,
+    get_session,
+)
+from fast_zero.hashing import HashingPoolSaturatedError, get_hashing_executor
 from fast_zero.models import User
-from fast_zero.settings import Settings
-
-pwd_context = PasswordHash.recommended()
+from fast_zero.settings import Settings, get_settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+user_cache = TTLCache(
+    maxsize=get_settings().USER_CACHE_MAXSIZE,
+    ttl=get_settings().USER_CACHE_TTL_SECONDS,
+    name="users",
+)
+claims_cache = TTLCache(
+    maxsize=get_settings().CLAIMS_CACHE_MAXSIZE,
+    name="token_claims",
+)
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    id: int
+    username: str
+    email: str
+
+
+@lru_cache
+def build_password_context(
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+) -> PasswordHash:
+    return PasswordHash(
+        (
+            Argon2Hasher(
+                time_cost=time_cost,
+                memory_cost=memory_cost,
+                parallelism=parallelism,
+            ),
+        )
+    )
+
+
+def get_password_context() -> PasswordHash:
+    settings = get_settings()
+    return build_password_context(
+        settings.ARGON2_TIME_COST,
+        settings.ARGON2_MEMORY_COST,
+        settings.ARGON2_PARALLELISM,
+    )
+
+
+def hashing_unavailable_exception() -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        detail="Password hashing is busy, try again later",
+        headers={
+            "Retry-After": str(get_settings().HASHING_RETRY_AFTER_SECONDS),
+        },
+    )
+
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    try:
+        return get_hashing_executor().run(
+            get_password_context().hash,
+            password,
+        )
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
 
 
 def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return get_hashing_executor().run(
+            get_password_context().verify,
+            plain_password,
+            hashed_password,
+        )
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    hasher = get_password_context().current_hasher
+    return not hasher.identify(hashed_password) or (
+        hasher.check_needs_rehash(hashed_password)
+    )
+
+
+def upgrade_password_hash(
+    session: Session,
+    user_id: int,
+    plain_password: str,
+    hashed_password: str,
+):
+    try:
+        new_hashed_password = get_hashing_executor().run(
+            get_password_context().hash,
+            plain_password,
+        )
+    except HashingPoolSaturatedError:
+        return
+
+    # Runs as a background task after the request session was closed, so
+    # the session reconnects here and must be closed again when done.
+    try:
+        session.execute(
+            update(User)
+            .where(User.id == user_id, User.password == hashed_password)
+            .values(password=new_hashed_password)
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+async def upgrade_password_hash_async(
+    session: AsyncSession,
+    user_id: int,
+    plain_password: str,
+    hashed_password: str,
+):
+    try:
+        new_hashed_password = await get_hashing_executor().run_async(
+            get_password_context().hash,
+            plain_password,
+        )
+    except HashingPoolSaturatedError:
+        return
+
+    try:
+        await session.execute(
+            update(User)
+            .where(User.id == user_id, User.password == hashed_password)
+            .values(password=new_hashed_password)
+        )
+        await session.commit()
+    finally:
+        await session.close()
+
+
+async def get_password_hash_async(password: str) -> str:
+    try:
+        return await get_hashing_executor().run_async(
+            get_password_context().hash,
+            password,
+        )
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    try:
+        return await get_hashing_executor().run_async(
+            get_password_context().verify,
+            plain_password,
+            hashed_password,
+        )
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
 
 
-def create_access_token(data: dict) -> str:
+def create_access_token(data: dict, settings: Settings | None = None) -> str:
+    settings = settings or get_settings()
     to_encode = data.copy()
 
     expire = datetime.now(tz=ZoneInfo("UTC")) + timedelta(
-        minutes=Settings().ACCESS_TOKEN_EXPIRE_MINUTES,
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
     )
 
     to_encode.update({"exp": expire})
-    secret_key = Settings().SECRET_KEY
-    algorithm = Settings().ALGORITHM
 
     return encode(
         to_encode,
-        secret_key,
-        algorithm=algorithm,
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
     )
 
 
-def get_current_user(
-    session: Session = Depends(get_session),
-    token: str = Depends(oauth2_scheme),
-):
-    credentials_exception = HTTPException(
-        status_code=HTTPStatus.UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
+def decode_token(token: str, settings: Settings | None = None) -> dict:
+    settings = settings or get_settings()
+    cache_key = (
+        settings.SECRET_KEY,
+        settings.ALGORITHM,
+        sha256(token.encode()).digest(),
     )
 
-    try:
+    payload = claims_cache.get(cache_key)
+
+    if payload is None:
         payload = decode(
             token,
-            Settings().SECRET_KEY,
-            algorithms=[Settings().ALGORITHM],
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
         )
-        username = payload.get("sub")
 
-        if not username:
-            raise credentials_exception
+        if "exp" in payload:
+            claims_cache.set(cache_key, payload, expires_at=payload["exp"])
+
+    return payload
+
+
+def get_claims_cache_stats() -> dict:
+    return {
+        "hits": claims_cache.hits,
+        "misses": claims_cache.misses,
+        "size": len(claims_cache),
+    }
+
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def get_token_subject(token: str, settings: Settings | None = None) -> str:
+    try:
+        payload = decode_token(token, settings)
     except ExpiredSignatureError:
-        raise credentials_exception
+        raise credentials_exception()
     except DecodeError:
-        raise credentials_exception
+        raise credentials_exception()
 
-    db_user = session.scalar(
-        select(User).where(User.email == username),
-    )
+    username = payload.get("sub")
+
+    if not username:
+        raise credentials_exception()
+
+    return username
 
+
+def cache_authenticated_user(
+    username: str,
+    db_user: User | None,
+) -> AuthenticatedUser:
     if not db_user:
-        raise credentials_exception
+        raise credentials_exception()
+
+    current_user = AuthenticatedUser(
+        id=db_user.id,
+        username=db_user.username,
+        email=db_user.email,
+    )
+    user_cache.set(username, current_user)
+
+    return current_user
+
+
+# A replica may not have caught up with a user who just signed up, so a
+# miss there is checked against the primary before it becomes a 401.
+def get_current_user(
+    session: Session = Depends(get_read_session),
+    primary_session: Session = Depends(get_session),
+    token: str = Depends(oauth2_scheme),
+    settings: Settings = Depends(get_settings),
+):
+    username = get_token_subject(token, settings)
+    current_user = user_cache.get(username)
+
+    if current_user:
+        return current_user
+
+    query = select(User).where(User.email == username)
+    db_user = session.scalar(query)
+
+    if db_user is None and session is not primary_session:
+        db_user = primary_session.scalar(query)
+
+    return cache_authenticated_user(username, db_user)
+
+
+async def get_current_user_async(
+    session: AsyncSession = Depends(get_async_read_session),
+    primary_session: AsyncSession = Depends(get_async_session),
+    token: str = Depends(oauth2_scheme),
+    settings: Settings = Depends(get_settings),
+):
+    username = get_token_subject(token, settings)
+    current_user = user_cache.get(username)
+
+    if current_user:
+        return current_user
+
+    query = select(User).where(User.email == username)
+    db_user = await session.scalar(query)
+
+    if db_user is None and session is not primary_session:
+        db_user = await primary_session.scalar(query)
+
+    return cache_authenticated_user(username, db_user)
+
 
-    return db_user
+def invalidate_user(email: str):
+    user_cache.pop(email)
@@ -1,5 +1,12 @@
+import logging
+from functools import lru_cache
+from typing import Literal
+
+from pydantic import ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+logger = logging.getLogger(__name__)
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -12,3 +19,82 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+
+    ASYNC_DATABASE_URL: str | None = None
+    ASYNC_MODE: bool = False
+
+    DATABASE_READ_URLS: list[str] = []
+    ASYNC_DATABASE_READ_URLS: list[str] = []
+    DATABASE_READ_RETRY_SECONDS: float = 30.0
+    DATABASE_READ_STICKY_SECONDS: float = 5.0
+    DATABASE_READ_STICKY_MAXSIZE: int = 10_000
+
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+
+    SQLITE_JOURNAL_MODE: Literal[
+        "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"
+    ] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268_435_456
+
+    USER_CACHE_MAXSIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    CLAIMS_CACHE_MAXSIZE: int = 10_000
+
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65_536
+    ARGON2_PARALLELISM: int = 4
+
+    HASHING_MAX_WORKERS: int = 2
+    HASHING_MAX_QUEUE: int = 8
+    HASHING_RETRY_AFTER_SECONDS: int = 1
+
+    LOGIN_IP_RATE_PER_SECOND: float = 1.0
+    LOGIN_IP_BURST: int = 20
+    LOGIN_USERNAME_RATE_PER_SECOND: float = 0.1
+    LOGIN_USERNAME_BURST: int = 5
+    LOGIN_LIMITER_MAXSIZE: int = 100_000
+    LOGIN_MAX_CONCURRENCY: int = 8
+
+    FAST_JSON_LISTS: bool = False
+
+    SLOW_QUERY_MS: float = 200.0
+
+    CHANGES_HISTORY_SIZE: int = 100
+    CHANGES_MAX_USERS: int = 10_000
+    CHANGES_LONG_POLL_SECONDS: float = 30.0
+    CHANGES_HEARTBEAT_SECONDS: float = 15.0
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
+
+
+# Only values read per request or per call pick up the
+# new file: token keys and lifetimes, Argon2 costs, FAST_JSON_LISTS,
+# SLOW_QUERY_MS, the change feed timeouts and the sticky-read cookie.
+# Objects built once at startup keep the configuration they were built
+# with until the process restarts: the database engines and read
+# replicas with their pool sizes, the user and claims caches, the hashing
+# executor, the login limiters, the change broker and ASYNC_MODE.
+def reload_settings() -> Settings:
+    # Parsed before the cache is cleared, so a broken file raises here and
+    # leaves the running configuration in place.
+    Settings()
+    get_settings.cache_clear()
+    return get_settings()
+
+
+# A signal handler runs inside whatever the main thread was doing, so a
+# bad file is logged rather than raised into it.
+def reload_settings_on_signal(*_):
+    try:
+        reload_settings()
+    except ValidationError:
+        logger.exception("Keeping current settings, reload failed")
@@ -1,15 +1,30 @@
+from contextlib import contextmanager
+
 import factory
 import factory.fuzzy
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import StaticPool, create_engine
+from sqlalchemy import NullPool, StaticPool, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
 
-from fast_zero.app import app
-from fast_zero.database import get_session
+from fast_zero.admission import get_login_admission
+from fast_zero.app import app, create_app
+from fast_zero.database import (
+    QueryRecorder,
+    get_async_session,
+    get_session,
+    instrument_statements,
+    recent_writers,
+)
+from fast_zero.events import broker
 from fast_zero.models import Todo, TodoState, User, table_registry
-from fast_zero.security import get_password_hash
-from fast_zero.settings import Settings
+from fast_zero.security import (
+    claims_cache,
+    get_password_hash,
+    user_cache,
+)
+from fast_zero.settings import Settings, get_settings
 
 
 class UserFactory(factory.Factory):
@@ -31,6 +46,29 @@ class TodoFactory(factory.Factory):
     user_id = 1
 
 
+@contextmanager
+def query_budget(max_statements: int):
+    with QueryRecorder(slowest=max_statements + 1) as recorder:
+        yield recorder
+
+    statements = "\n".join(statement for _, statement in recorder.slowest)
+    assert recorder.statements <= max_statements, (
+        f"{recorder.statements} statements, budget is {max_statements}:\n"
+        f"{statements}"
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    yield
+    get_settings.cache_clear()
+    get_login_admission.cache_clear()
+    user_cache.clear()
+    claims_cache.clear()
+    broker.clear()
+    recent_writers.clear()
+
+
 @pytest.fixture
 def client(session):
     def fake_session_override():
@@ -44,6 +82,35 @@ def client(session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def async_client(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(database_url)
+    table_registry.metadata.create_all(engine)
+    engine.dispose()
+
+    async_engine = create_async_engine(
+        database_url.replace("sqlite", "sqlite+aiosqlite", 1),
+        poolclass=NullPool,
+    )
+    instrument_statements(async_engine.sync_engine)
+
+    async def fake_async_session_override():
+        async with AsyncSession(
+            async_engine,
+            expire_on_commit=False,
+        ) as session:
+            yield session
+
+    async_app = create_app(async_mode=True)
+    async_app.dependency_overrides[get_async_session] = (
+        fake_async_session_override
+    )
+
+    with TestClient(async_app) as client:
+        yield client
+
+
 @pytest.fixture
 def session():
     engine = create_engine(
@@ -51,6 +118,7 @@ def session():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    instrument_statements(engine)
     table_registry.metadata.create_all(engine)
 
     with Session(engine) as session:
@@ -60,6 +128,19 @@ def session():
     table_registry.metadata.drop_all(engine)
 
 
+@pytest.fixture
+def statements(session):
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
 @pytest.fixture
 def user(session):
     pwd = "password"
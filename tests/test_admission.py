@@ -0,0 +1,142 @@
+from http import HTTPStatus
+
+import pytest
+from freezegun import freeze_time
+
+from fast_zero.admission import (
+    ConcurrencyLimiter,
+    TokenBucketLimiter,
+    get_login_admission,
+)
+from fast_zero.metrics import login_rejections, password_hashing_duration
+from fast_zero.settings import reload_settings
+from tests.conftest import query_budget
+
+
+@pytest.fixture
+def login_limits(monkeypatch):
+    def configure(**limits):
+        for name, value in limits.items():
+            monkeypatch.setenv(name, str(value))
+
+        reload_settings()
+        get_login_admission.cache_clear()
+
+    return configure
+
+
+def login(client, username, password="wrong"):
+    return client.post(
+        "/auth/token",
+        data={"username": username, "password": password},
+    )
+
+
+def test_token_bucket_should_allow_burst_then_refill():
+    limiter = TokenBucketLimiter(rate=0.5, burst=2, maxsize=10)
+
+    with freeze_time("2026-01-01") as frozen:
+        assert limiter.acquire("key") == 0
+        assert limiter.acquire("key") == 0
+        assert limiter.acquire("key") == pytest.approx(2.0)
+
+        frozen.tick(1)
+        assert limiter.acquire("key") == pytest.approx(1.0)
+
+        frozen.tick(1)
+        assert limiter.acquire("key") == 0
+
+
+def test_token_bucket_should_keep_keys_apart():
+    limiter = TokenBucketLimiter(rate=1, burst=1, maxsize=10)
+
+    assert limiter.acquire("first") == 0
+    assert limiter.acquire("first") > 0
+    assert limiter.acquire("second") == 0
+
+
+def test_token_bucket_should_bound_tracked_keys():
+    expected_size = 2
+    limiter = TokenBucketLimiter(rate=1, burst=1, maxsize=expected_size)
+
+    for key in range(100):
+        limiter.acquire(key)
+
+    assert len(limiter) == expected_size
+
+
+def test_concurrency_limiter_should_cap_slots():
+    limiter = ConcurrencyLimiter(1)
+
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    limiter.release()
+
+    assert limiter.try_acquire()
+
+
+def test_login_should_be_limited_per_ip(client, user, login_limits):
+    login_limits(LOGIN_IP_BURST=1, LOGIN_IP_RATE_PER_SECOND=0.25)
+    rejections = login_rejections.value(("ip",))
+
+    assert login(client, user.email).status_code == HTTPStatus.UNAUTHORIZED
+
+    hashes = password_hashing_duration.count()
+    with query_budget(0):
+        response = login(client, "other@example.com")
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.headers["Retry-After"] == "4"
+    assert password_hashing_duration.count() == hashes
+    assert login_rejections.value(("ip",)) == rejections + 1
+
+
+def test_login_should_be_limited_per_username(client, user, login_limits):
+    login_limits(LOGIN_USERNAME_BURST=2, LOGIN_USERNAME_RATE_PER_SECOND=0.1)
+
+    for _ in range(2):
+        assert login(client, user.email).status_code == HTTPStatus.UNAUTHORIZED
+
+    hashes = password_hashing_duration.count()
+    with query_budget(0):
+        response = login(client, user.email.upper())
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.headers["Retry-After"] == "10"
+    assert password_hashing_duration.count() == hashes
+    assert login(client, "other@example.com").status_code == (
+        HTTPStatus.UNAUTHORIZED
+    )
+
+
+def test_login_should_cap_concurrency(client, user, login_limits):
+    login_limits(LOGIN_MAX_CONCURRENCY=1)
+    concurrency = get_login_admission().concurrency
+    concurrency.try_acquire()
+
+    with query_budget(0):
+        response = login(client, user.email, user.clean_password)
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert "Retry-After" in response.headers
+
+    concurrency.release()
+    response = login(client, user.email, user.clean_password)
+
+    assert response.status_code == HTTPStatus.OK
+    assert concurrency.try_acquire()
+
+
+def test_async_login_should_be_limited_per_ip(async_client, login_limits):
+    login_limits(LOGIN_IP_BURST=1)
+
+    assert login(async_client, "missing@example.com").status_code == (
+        HTTPStatus.UNAUTHORIZED
+    )
+
+    with query_budget(0):
+        response = login(async_client, "missing@example.com")
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,304 @@
+from http import HTTPStatus
+
+import pytest
+
+from fast_zero.events import broker
+from fast_zero.settings import reload_settings
+
+
+@pytest.fixture
+def async_user(async_client):
+    user = {
+        "username": "asyncuser",
+        "email": "asyncuser@example.com",
+        "password": "password",
+    }
+    response = async_client.post("/users/", json=user)
+
+    return {**response.json(), "password": user["password"]}
+
+
+@pytest.fixture
+def async_headers(async_client, async_user):
+    response = async_client.post(
+        "/auth/token",
+        data={
+            "username": async_user["email"],
+            "password": async_user["password"],
+        },
+    )
+
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_async_create_user_should_return_409_if_email_exists(
+    async_client,
+    async_user,
+):
+    response = async_client.post(
+        "/users/",
+        json={
+            "username": "newuser",
+            "email": async_user["email"],
+            "password": "password",
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+
+
+def test_async_login_should_return_401_if_invalid_credentials(
+    async_client,
+    async_user,
+):
+    response = async_client.post(
+        "/auth/token",
+        data={"username": async_user["email"], "password": "wrong"},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_async_refresh_token(async_client, async_headers):
+    response = async_client.get("/auth/refresh_token", headers=async_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert "access_token" in response.json()
+
+
+def test_async_read_users(async_client, async_user):
+    response = async_client.get("/users/")
+
+    assert response.json() == {
+        "users": [
+            {
+                "id": async_user["id"],
+                "username": async_user["username"],
+                "email": async_user["email"],
+            },
+        ],
+        "next_cursor": None,
+    }
+
+
+def test_async_update_user(async_client, async_user, async_headers):
+    response = async_client.put(
+        f"/users/{async_user['id']}",
+        headers=async_headers,
+        json={
+            "username": "updateduser",
+            "email": "updateduser@example.com",
+            "password": "newpassword",
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["username"] == "updateduser"
+
+
+def test_async_delete_user(async_client, async_user, async_headers):
+    response = async_client.delete(
+        f"/users/{async_user['id']}",
+        headers=async_headers,
+    )
+
+    assert response.status_code == HTTPStatus.NO_CONTENT
+
+
+def test_async_todos_crud(async_client, async_headers):
+    todo = {
+        "title": "Test todo",
+        "description": "Test todo description",
+        "state": "draft",
+    }
+
+    created = async_client.post("/todos/", headers=async_headers, json=todo)
+    todo_id = created.json()["id"]
+
+    updated = async_client.put(
+        f"/todos/{todo_id}",
+        headers=async_headers,
+        json={**todo, "state": "done"},
+    )
+    listed = async_client.get("/todos/?state=done", headers=async_headers)
+    deleted = async_client.delete(f"/todos/{todo_id}", headers=async_headers)
+    missing = async_client.delete(f"/todos/{todo_id}", headers=async_headers)
+
+    assert created.json() == {"id": todo_id, **todo}
+    assert updated.json()["state"] == "done"
+    assert listed.json() == {"todos": [updated.json()], "next_cursor": None}
+    assert deleted.status_code == HTTPStatus.OK
+    assert missing.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_async_todos_bulk(async_client, async_headers):
+    created = async_client.post(
+        "/todos/bulk",
+        json={
+            "todos": [
+                {"title": "a", "description": "a", "state": "draft"},
+                {"title": "b", "description": "b", "state": "todo"},
+            ]
+        },
+        headers=async_headers,
+    ).json()["todos"]
+    ids = [todo["id"] for todo in created]
+
+    updated = async_client.patch(
+        "/todos/bulk",
+        json={"todos": [{"id": ids[0], "state": "done"}, {"id": ids[1]}]},
+        headers=async_headers,
+    )
+    deleted = async_client.request(
+        "DELETE",
+        "/todos/bulk",
+        json={"ids": ids},
+        headers=async_headers,
+    )
+
+    assert [todo["state"] for todo in updated.json()["todos"]] == ["done"]
+    assert deleted.json() == {"deleted": ids, "errors": []}
+
+
+def test_async_export_todos(async_client, async_headers):
+    async_client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "draft"},
+        headers=async_headers,
+    )
+
+    response = async_client.get(
+        "/todos/export",
+        params={"format": "csv"},
+        headers=async_headers,
+    )
+
+    assert response.text.splitlines() == [
+        "id,title,description,state",
+        "1,a,a,draft",
+    ]
+
+
+def test_async_import_todos(async_client, async_headers):
+    response = async_client.post(
+        "/todos/import",
+        files={
+            "file": (
+                "todos.ndjson",
+                b'{"title": "a", "description": "a", "state": "todo"}\n{}\n',
+            )
+        },
+        headers=async_headers,
+    )
+
+    assert response.json()["accepted"] == 1
+    assert response.json()["rejected"] == 1
+
+
+def test_async_patch_todo(async_client, async_headers):
+    todo = async_client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "draft"},
+        headers=async_headers,
+    ).json()
+
+    response = async_client.patch(
+        f"/todos/{todo['id']}",
+        json={"state": "doing"},
+        headers=async_headers,
+    )
+
+    assert response.json() == {**todo, "state": "doing"}
+
+
+def test_async_patch_todo_with_empty_body_should_not_publish(
+    async_client,
+    async_user,
+    async_headers,
+):
+    todo = async_client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "draft"},
+        headers=async_headers,
+    ).json()
+    revision = broker.revision(async_user["id"])
+
+    response = async_client.patch(
+        f"/todos/{todo['id']}",
+        json={},
+        headers=async_headers,
+    )
+
+    assert response.json() == todo
+    assert broker.revision(async_user["id"]) == revision
+
+
+def test_async_read_todo_stats(async_client, async_headers):
+    async_client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "todo"},
+        headers=async_headers,
+    )
+
+    response = async_client.get("/todos/stats", headers=async_headers)
+
+    assert response.json()["counts"]["todo"] == 1
+    assert response.json()["total"] == 1
+
+
+def test_async_list_todos_etag(async_client, async_headers):
+    first = async_client.get("/todos/", headers=async_headers)
+
+    cached = async_client.get(
+        "/todos/",
+        headers={**async_headers, "If-None-Match": first.headers["etag"]},
+    )
+
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_async_list_fast_json(async_client, async_headers, monkeypatch):
+    async_client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "draft"},
+        headers=async_headers,
+    )
+    default_todos = async_client.get("/todos/", headers=async_headers)
+    default_users = async_client.get("/users/")
+
+    monkeypatch.setenv("FAST_JSON_LISTS", "true")
+    reload_settings()
+    todos = async_client.get("/todos/", headers=async_headers)
+    users = async_client.get("/users/")
+
+    assert todos.json() == default_todos.json()
+    assert todos.headers["etag"] == default_todos.headers["etag"]
+    assert users.json() == default_users.json()
+
+
+def test_async_todo_changes(async_client, async_headers):
+    async_client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "draft"},
+        headers=async_headers,
+    )
+
+    response = async_client.get(
+        "/todos/changes?since=0", headers=async_headers
+    )
+
+    assert response.json()["events"][0]["type"] == "created"
+
+
+def test_async_import_todos_should_reject_csv_header(
+    async_client,
+    async_headers,
+):
+    response = async_client.post(
+        "/todos/import",
+        params={"format": "csv"},
+        files={"file": ("todos.csv", b"title\nx")},
+        headers=async_headers,
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
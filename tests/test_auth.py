@@ -1,6 +1,15 @@
 from http import HTTPStatus
 
 from freezegun import freeze_time
+from sqlalchemy import select
+
+from fast_zero.models import User
+from fast_zero.security import (
+    build_password_context,
+    password_needs_rehash,
+    verify_password,
+)
+from tests.conftest import UserFactory
 
 
 def test_get_token_should_return_jwt_token(client, user):
@@ -98,3 +107,39 @@ def test_token_expired_dont_refresh(client, user):
 
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert response.json()["detail"] == "Could not validate credentials"
+
+
+def test_login_should_upgrade_outdated_password_hash(session, client):
+    password = "password"
+    outdated_hash = build_password_context(1, 8, 1).hash(password)
+    user = UserFactory(password=outdated_hash)
+    session.add(user)
+    session.commit()
+    user_id, email = user.id, user.email
+
+    response = client.post(
+        "auth/token",
+        data={"username": email, "password": password},
+    )
+
+    stored_hash = session.scalar(
+        select(User.password).where(User.id == user_id),
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert stored_hash != outdated_hash
+    assert not password_needs_rehash(stored_hash)
+    assert verify_password(password, stored_hash)
+
+
+def test_login_should_keep_current_password_hash(session, client, user):
+    hashed_password = user.password
+
+    client.post(
+        "auth/token",
+        data={"username": user.email, "password": user.clean_password},
+    )
+
+    stored_hash = session.scalar(
+        select(User.password).where(User.id == user.id),
+    )
+    assert stored_hash == hashed_password
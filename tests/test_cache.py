@@ -0,0 +1,46 @@
+from freezegun import freeze_time
+
+from fast_zero.cache import TTLCache
+
+
+def test_ttl_cache_should_evict_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert len(cache) == cache.maxsize
+
+
+def test_ttl_cache_should_expire_entries():
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    with freeze_time("2025-01-01 12:00:00"):
+        cache.set("a", 1)
+
+    with freeze_time("2025-01-01 12:00:59"):
+        assert cache.get("a") == 1
+
+    with freeze_time("2025-01-01 12:01:00"):
+        assert cache.get("a") is None
+
+
+def test_ttl_cache_should_count_hits_and_misses():
+    cache = TTLCache(maxsize=10)
+    cache.set("a", 1)
+
+    cache.get("a")
+    cache.get("b")
+
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_cache_pop_should_remove_entry():
+    cache = TTLCache(maxsize=10)
+    cache.set("a", 1)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
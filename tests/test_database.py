@@ -0,0 +1,119 @@
+import pytest
+from sqlalchemy import text
+
+from fast_zero.database import (
+    QueryRecorder,
+    TimedQueuePool,
+    build_engine,
+    engine_options,
+    get_async_database_url,
+)
+from fast_zero.metrics import (
+    db_pool_checked_out,
+    db_pool_checkout_wait,
+    db_pool_checkouts,
+)
+from fast_zero.settings import get_settings, reload_settings
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_build_engine_should_configure_pool(file_engine):
+    settings = get_settings()
+
+    assert isinstance(file_engine.pool, TimedQueuePool)
+    assert file_engine.pool.size() == settings.DATABASE_POOL_SIZE
+
+
+def test_build_engine_should_apply_sqlite_pragmas(file_engine):
+    settings = get_settings()
+
+    with file_engine.connect() as connection:
+        journal_mode = connection.scalar(text("PRAGMA journal_mode"))
+        busy_timeout = connection.scalar(text("PRAGMA busy_timeout"))
+
+    assert journal_mode == settings.SQLITE_JOURNAL_MODE.lower()
+    assert busy_timeout == settings.SQLITE_BUSY_TIMEOUT_MS
+
+
+def test_build_engine_should_record_pool_metrics(file_engine):
+    checkouts = db_pool_checkouts.value()
+    waits = db_pool_checkout_wait.count()
+    checked_out = db_pool_checked_out.value()
+
+    with file_engine.connect():
+        assert db_pool_checked_out.value() == checked_out + 1
+
+    assert db_pool_checkouts.value() == checkouts + 1
+    assert db_pool_checkout_wait.count() == waits + 1
+    assert db_pool_checked_out.value() == checked_out
+
+
+def test_engine_options_should_skip_pool_for_sqlite_memory():
+    assert engine_options(get_settings(), "sqlite://", is_async=False) == {}
+
+
+def test_get_async_database_url_should_use_aiosqlite(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///database.db")
+    reload_settings()
+
+    assert get_async_database_url() == "sqlite+aiosqlite:///database.db"
+
+
+def test_get_async_database_url_should_require_url_for_other_databases(
+    monkeypatch,
+):
+    monkeypatch.setenv("DATABASE_URL", "postgresql://localhost/fast_zero")
+    reload_settings()
+
+    with pytest.raises(ValueError, match="ASYNC_DATABASE_URL"):
+        get_async_database_url()
+
+
+def test_query_recorder_should_keep_slowest_statements():
+    recorder = QueryRecorder(slowest=2)
+
+    for elapsed, statement in ((0.1, "a"), (0.3, "b"), (0.2, "c")):
+        recorder.record(statement, elapsed)
+
+    assert recorder.statements == len("abc")
+    assert recorder.seconds == pytest.approx(0.6)
+    assert recorder.slowest == [(0.3, "b"), (0.2, "c")]
+
+
+def test_query_recorders_should_nest(file_engine):
+    with file_engine.connect() as connection:
+        with QueryRecorder() as outer:
+            connection.execute(text("SELECT 1"))
+
+            with QueryRecorder() as inner:
+                connection.execute(text("SELECT 2"))
+
+        connection.execute(text("SELECT 3"))
+
+    assert [statement for _, statement in inner.slowest] == ["SELECT 2"]
+    assert sorted(statement for _, statement in outer.slowest) == [
+        "SELECT 1",
+        "SELECT 2",
+    ]
+
+
+def test_slow_query_should_log_sql_without_parameters(
+    file_engine,
+    monkeypatch,
+    caplog,
+):
+    monkeypatch.setenv("SLOW_QUERY_MS", "0")
+    reload_settings()
+
+    with file_engine.connect() as connection:
+        connection.execute(text("SELECT :secret"), {"secret": "hunter2"})
+
+    assert "Slow query took" in caplog.text
+    assert "SELECT ?" in caplog.text
+    assert "hunter2" not in caplog.text
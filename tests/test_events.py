@@ -0,0 +1,235 @@
+import asyncio
+import threading
+from http import HTTPStatus
+
+import pytest
+
+from fast_zero.events import (
+    ChangeBroker,
+    ChangeHistoryExpiredError,
+    broker,
+    stream_changes,
+)
+from fast_zero.settings import reload_settings
+
+
+def test_change_broker_should_trim_history_and_expire_old_revisions():
+    change_broker = ChangeBroker(history_size=2, max_users=10)
+    first = change_broker.publish(1, "created", {"todos": []})
+    change_broker.publish(2, "created", {"todos": []})
+    second = change_broker.publish(1, "updated", {"todos": []})
+    third = change_broker.publish(1, "deleted", {"ids": [1]})
+
+    assert change_broker.events_since(1, first.revision) == [second, third]
+    assert change_broker.revision(1) == third.revision
+
+    with pytest.raises(ChangeHistoryExpiredError):
+        change_broker.events_since(1, 0)
+
+
+def test_change_broker_should_not_reuse_revisions_after_eviction():
+    change_broker = ChangeBroker(history_size=10, max_users=1)
+    event = change_broker.publish(1, "created", {"todos": []})
+    change_broker.publish(2, "created", {"todos": []})
+
+    assert change_broker.events_since(1, change_broker.revision(1)) == []
+    with pytest.raises(ChangeHistoryExpiredError):
+        change_broker.events_since(1, event.revision - 1)
+
+
+def test_change_broker_should_expire_revisions_from_the_future():
+    change_broker = ChangeBroker(history_size=10, max_users=10)
+    event = change_broker.publish(1, "created", {"todos": []})
+
+    assert change_broker.events_since(1, event.revision) == []
+    with pytest.raises(ChangeHistoryExpiredError):
+        change_broker.events_since(1, event.revision + 1)
+
+
+def test_change_broker_should_notify_subscribers_from_other_threads():
+    change_broker = ChangeBroker(history_size=10, max_users=10)
+
+    async def listen():
+        with change_broker.subscribe(1) as queue:
+            threading.Thread(
+                target=change_broker.publish,
+                args=(1, "created", {"todos": []}),
+            ).start()
+            return await asyncio.wait_for(queue.get(), 1)
+
+    event = asyncio.run(listen())
+
+    assert event.type == "created"
+    assert change_broker.subscriber_count() == 0
+
+
+def test_stream_changes_should_replay_from_last_event_id():
+    first = broker.publish(1, "created", {"todos": [{"id": 1}]})
+    broker.publish(1, "deleted", {"ids": [1]})
+
+    async def read(count):
+        stream = stream_changes(
+            1,
+            broker.cursor(first.revision - 1),
+            heartbeat=0.01,
+        )
+        chunks = [await anext(stream) for _ in range(count)]
+        await stream.aclose()
+        return chunks
+
+    chunks = asyncio.run(read(3))
+
+    assert chunks[0].startswith(f"id: {first.cursor}\nevent: created\n")
+    assert chunks[1].endswith('data: {"ids": [1]}\n\n')
+    assert chunks[2] == ": keepalive\n\n"
+
+
+@pytest.mark.parametrize("last_event_id", ["future", "epoch", "plain"])
+def test_stream_changes_should_reset_for_unknown_last_event_id(
+    last_event_id,
+):
+    broker.publish(1, "created", {"todos": [{"id": 1}]})
+    broker.publish(1, "deleted", {"ids": [1]})
+    cursors = {
+        "future": broker.cursor(500),
+        "epoch": f"{ChangeBroker(10, 10).epoch}.1",
+        "plain": "1",
+    }
+
+    async def read():
+        stream = stream_changes(1, cursors[last_event_id], heartbeat=0.01)
+        chunk = await anext(stream)
+        await stream.aclose()
+        return chunk
+
+    cursor = broker.cursor(broker.revision(1))
+
+    assert asyncio.run(read()) == f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+
+
+def test_todo_changes_should_return_events_since_revision(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    todo = client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "draft"},
+        headers=headers,
+    ).json()
+    client.patch(
+        f"/todos/{todo['id']}", json={"state": "done"}, headers=headers
+    )
+    client.delete(f"/todos/{todo['id']}", headers=headers)
+
+    response = client.get("/todos/changes?since=0", headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert [event["type"] for event in response.json()["events"]] == [
+        "created",
+        "updated",
+        "deleted",
+    ]
+    assert response.json()["events"][1]["data"]["todos"][0]["state"] == "done"
+    assert (
+        response.json()["revision"]
+        == (response.json()["events"][-1]["revision"])
+    )
+
+
+def test_todo_changes_should_wake_long_poll_on_write(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    responses = []
+    poll = threading.Thread(
+        target=lambda: responses.append(
+            client.get("/todos/changes", headers=headers)
+        )
+    )
+    poll.start()
+
+    while not broker.subscriber_count():
+        pass
+
+    client.post(
+        "/todos/bulk",
+        json={"todos": [{"title": "a", "description": "a", "state": "todo"}]},
+        headers=headers,
+    )
+    poll.join(5)
+
+    assert responses[0].json()["events"][0]["type"] == "created"
+
+
+def test_todo_changes_should_time_out_without_events(
+    client,
+    token,
+    monkeypatch,
+):
+    monkeypatch.setenv("CHANGES_LONG_POLL_SECONDS", "0.01")
+    reload_settings()
+
+    response = client.get(
+        "/todos/changes?since=0",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.json() == {"revision": broker.cursor(0), "events": []}
+
+
+def test_todo_changes_should_return_410_for_trimmed_history(
+    client,
+    user,
+    token,
+    monkeypatch,
+):
+    monkeypatch.setattr(broker, "history_size", 1)
+    broker.publish(user.id, "deleted", {"ids": [1]})
+    broker.publish(user.id, "deleted", {"ids": [2]})
+
+    response = client.get(
+        "/todos/changes?since=0",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.GONE
+
+
+def test_todo_changes_should_return_410_for_revision_from_the_future(
+    client,
+    user,
+    token,
+):
+    broker.publish(user.id, "deleted", {"ids": [1]})
+    broker.publish(user.id, "deleted", {"ids": [2]})
+
+    response = client.get(
+        "/todos/changes",
+        params={"since": broker.cursor(500)},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.GONE
+
+
+def test_todo_changes_should_return_410_for_another_epoch(
+    client,
+    user,
+    token,
+):
+    headers = {"Authorization": f"Bearer {token}"}
+    first = broker.publish(user.id, "deleted", {"ids": [1]})
+    broker.publish(user.id, "deleted", {"ids": [2]})
+    restarted = ChangeBroker(history_size=10, max_users=10)
+
+    current = client.get(
+        "/todos/changes",
+        params={"since": first.cursor},
+        headers=headers,
+    )
+    other_epoch = client.get(
+        "/todos/changes",
+        params={"since": f"{restarted.epoch}.{first.revision}"},
+        headers=headers,
+    )
+
+    assert [event["data"] for event in current.json()["events"]] == [
+        {"ids": [2]}
+    ]
+    assert other_epoch.status_code == HTTPStatus.GONE
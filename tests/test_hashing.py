@@ -0,0 +1,83 @@
+import asyncio
+from http import HTTPStatus
+from threading import Event
+
+import pytest
+
+from fast_zero import security
+from fast_zero.hashing import HashingExecutor, HashingPoolSaturatedError
+from fast_zero.metrics import password_hashing_duration
+
+
+@pytest.fixture
+def saturated_executor():
+    release = Event()
+    executor = HashingExecutor(max_workers=1, max_queue=0)
+    executor.submit(release.wait)
+
+    yield executor
+
+    release.set()
+    executor.shutdown()
+
+
+def test_hashing_executor_should_run_function():
+    executor = HashingExecutor(max_workers=1, max_queue=0)
+
+    assert executor.run(sum, [1, 2]) == sum([1, 2])
+    assert asyncio.run(executor.run_async(sum, [1, 2])) == sum([1, 2])
+
+
+def test_hashing_executor_should_time_function():
+    executor = HashingExecutor(max_workers=1, max_queue=0)
+    hashes = password_hashing_duration.count()
+
+    executor.run(sum, [1, 2])
+
+    assert password_hashing_duration.count() == hashes + 1
+
+
+def test_hashing_executor_should_reject_when_saturated(saturated_executor):
+    with pytest.raises(HashingPoolSaturatedError):
+        saturated_executor.submit(sum, [1, 2])
+
+
+def test_hashing_executor_should_release_slot_after_completion():
+    executor = HashingExecutor(max_workers=1, max_queue=0)
+
+    executor.run(sum, [1, 2])
+
+    assert executor.run(sum, [1, 2]) == sum([1, 2])
+
+
+def test_password_hash_async_should_verify():
+    password = "secret"
+    hashed_password = asyncio.run(security.get_password_hash_async(password))
+
+    assert asyncio.run(
+        security.verify_password_async(password, hashed_password),
+    )
+
+
+def test_create_user_should_return_503_when_hashing_saturated(
+    client,
+    monkeypatch,
+    saturated_executor,
+):
+    monkeypatch.setattr(
+        security,
+        "get_hashing_executor",
+        lambda: saturated_executor,
+    )
+
+    response = client.post(
+        "/users/",
+        json={
+            "username": "testuser",
+            "email": "testuser@example.com",
+            "password": "password",
+        },
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,48 @@
+from sqlalchemy import select, update
+
+from fast_zero.maintenance import main, rebuild_todo_counters
+from fast_zero.models import TodoCounter, TodoState
+from tests.conftest import TodoFactory
+
+
+def counters(session):
+    return dict(
+        session.execute(
+            select(TodoCounter.state, TodoCounter.count).where(
+                TodoCounter.count > 0,
+            )
+        ).all()
+    )
+
+
+def test_rebuild_todo_counters_should_fix_drifted_counts(session, user):
+    expected_done = 3
+    session.bulk_save_objects(
+        TodoFactory.create_batch(expected_done, user_id=user.id, state="done"),
+    )
+    session.add(TodoFactory(user_id=user.id, state="draft"))
+    session.commit()
+    session.execute(update(TodoCounter).values(count=42))
+    session.commit()
+
+    rebuild_todo_counters(session)
+
+    assert counters(session) == {
+        TodoState.done: expected_done,
+        TodoState.draft: 1,
+    }
+
+
+def test_maintenance_main_should_report_rebuilt_rows(
+    session,
+    monkeypatch,
+    capsys,
+):
+    monkeypatch.setattr(
+        "fast_zero.maintenance.engine",
+        session.get_bind(),
+    )
+
+    main(["rebuild-counters"])
+
+    assert capsys.readouterr().out == "rebuild-counters: 0 rows\n"
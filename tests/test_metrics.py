@@ -0,0 +1,136 @@
+from http import HTTPStatus
+
+from fast_zero.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    cache_hits,
+    cache_misses,
+    db_statement_duration,
+    http_request_duration,
+    http_request_statement_duration,
+    http_request_statements,
+    render_metrics,
+)
+from fast_zero.settings import reload_settings
+
+
+def test_render_metrics_should_use_prometheus_text_format():
+    metrics_registry = MetricsRegistry()
+    counter = metrics_registry.register(
+        Counter("requests_total", "Requests", ("path",)),
+    )
+    histogram = metrics_registry.register(
+        Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0)),
+    )
+    counter.inc(labels=('/say "hi"',))
+    histogram.observe(0.5)
+
+    assert render_metrics(metrics_registry) == (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="/say \\"hi\\""} 1.0\n'
+        "# HELP latency_seconds Latency\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{le="0.1"} 0\n'
+        'latency_seconds_bucket{le="1.0"} 1\n'
+        'latency_seconds_bucket{le="+Inf"} 1\n'
+        "latency_seconds_count 1\n"
+        "latency_seconds_sum 0.5\n"
+    )
+
+
+def test_metrics_should_label_requests_by_route_template(client, user):
+    labels = ("GET", "/users/", "200")
+    requests = http_request_duration.count(labels)
+
+    client.get("/users/")
+    client.get("/users/", params={"limit": 1})
+    response = client.get("/metrics")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == PROMETHEUS_CONTENT_TYPE
+    assert http_request_duration.count(labels) == requests + 2
+    assert (
+        "http_request_duration_seconds_count"
+        '{method="GET",route="/users/",status="200"}'
+    ) in response.text
+    assert 'route="/users/?limit=1"' not in response.text
+
+
+def test_metrics_should_label_unmatched_requests(client):
+    labels = ("GET", "unmatched", "404")
+    requests = http_request_duration.count(labels)
+
+    client.get("/missing/1")
+
+    assert http_request_duration.count(labels) == requests + 1
+
+
+def test_metrics_should_record_statements_per_request(
+    client,
+    token,
+    statements,
+):
+    labels = ("GET", "/todos/")
+    requests = http_request_statements.count(labels)
+    statement_total = http_request_statements.sum(labels)
+    statement_count = db_statement_duration.count()
+
+    client.get("/todos/", headers={"Authorization": f"Bearer {token}"})
+
+    assert http_request_statements.count(labels) == requests + 1
+    assert http_request_statements.sum(labels) == statement_total + len(
+        statements
+    )
+    assert db_statement_duration.count() == statement_count + len(statements)
+
+
+def test_metrics_should_count_requests_without_statements(client):
+    labels = ("GET", "unmatched")
+    requests = http_request_statements.count(labels)
+    timed = http_request_statement_duration.count(labels)
+    statement_total = http_request_statements.sum(labels)
+
+    client.get("/missing/1")
+
+    assert http_request_statements.count(labels) == requests + 1
+    assert http_request_statement_duration.count(labels) == timed + 1
+    assert http_request_statements.sum(labels) == statement_total
+
+
+def test_metrics_should_log_requests_slow_in_sql(
+    client,
+    user,
+    monkeypatch,
+    caplog,
+):
+    monkeypatch.setenv("SLOW_QUERY_MS", "0")
+    reload_settings()
+
+    client.get("/users/")
+
+    assert "GET /users/ spent" in caplog.text
+    assert "FROM users" in caplog.text
+
+
+def test_metrics_should_report_auth_caches(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    caches = ("token_claims", "users")
+    hits = [cache_hits.value((cache,)) for cache in caches]
+    misses = [cache_misses.value((cache,)) for cache in caches]
+
+    client.get("/todos/", headers=headers)
+    client.get("/todos/", headers=headers)
+    response = client.get("/metrics")
+
+    assert [cache_hits.value((cache,)) for cache in caches] == [
+        value + 1 for value in hits
+    ]
+    assert [cache_misses.value((cache,)) for cache in caches] == [
+        value + 1 for value in misses
+    ]
+    assert 'cache_hits_total{cache="token_claims"}' in response.text
+    assert 'cache_misses_total{cache="users"}' in response.text
+    assert 'cache_entries{cache="users"} 1' in response.text
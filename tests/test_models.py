@@ -1,6 +1,9 @@
-from sqlalchemy import select
+from sqlalchemy import select, text
 
-from fast_zero.models import User
+from fast_zero.models import Todo, TodoCounter, TodoState, User
+from fast_zero.pagination import encode_cursor
+from fast_zero.routers.todos import list_todos_query
+from fast_zero.schemas import FilterTodo
 
 
 def test_user_model(session):
@@ -24,3 +27,71 @@ def test_user_model(session):
     assert result.username == "testuser"
     assert result.email == "testuser@example.com"
     assert result.password == "password123"
+
+
+def test_delete_user_should_remove_todo_counters(session, user):
+    session.execute(text("PRAGMA foreign_keys = ON"))
+    todo = Todo(
+        title="t",
+        description="d",
+        state=TodoState.draft,
+        user_id=user.id,
+    )
+    session.add(todo)
+    session.commit()
+    session.delete(todo)
+    session.commit()
+
+    session.delete(user)
+    session.commit()
+
+    assert session.scalars(select(TodoCounter)).all() == []
+
+
+def query_plan(session, query) -> str:
+    compiled = query.compile(
+        session.get_bind(),
+        compile_kwargs={"literal_binds": True},
+    )
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_list_todos_by_state_should_use_composite_index(session):
+    query = list_todos_query(1, FilterTodo(state=TodoState.draft), "sqlite")
+
+    plan = query_plan(session, query)
+
+    assert "USING INDEX ix_todos_user_id_state_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_list_todos_should_use_user_index_for_ordering(session):
+    query = list_todos_query(
+        1,
+        FilterTodo(cursor=encode_cursor(1, 10)),
+        "sqlite",
+    )
+
+    plan = query_plan(session, query)
+
+    assert "USING INDEX ix_todos_user_id_id (user_id=? AND id>?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_search_todos_should_use_full_text_index(session):
+    query = list_todos_query(1, FilterTodo(search="milk"), "sqlite")
+
+    plan = query_plan(session, query)
+
+    assert "VIRTUAL TABLE INDEX" in plan
+    assert "SEARCH todos USING INTEGER PRIMARY KEY" in plan
+
+
+def test_user_lookup_by_email_should_use_unique_index(session):
+    query = select(User).where(User.email == "testuser@example.com")
+
+    plan = query_plan(session, query)
+
+    assert "USING INDEX sqlite_autoindex_users" in plan
+    assert "(email=?)" in plan
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from fast_zero.security import claims_cache, user_cache
+from tests.conftest import query_budget
+
+TODO = {"title": "budget", "description": "budget", "state": "draft"}
+USER = {
+    "username": "budget",
+    "email": "budget@example.com",
+    "password": "password",
+}
+NDJSON = "\n".join(json.dumps(TODO) for _ in range(3)).encode()
+
+# (method, url, request options, max statements). Every request runs with
+# cold user and claims caches, so the get_current_user lookup is counted.
+BUDGETS = [
+    ("POST", "/auth/token", {"data": {"username": "", "password": ""}}, 1),
+    ("GET", "/auth/refresh_token", {}, 1),
+    ("POST", "/users/", {"json": USER}, 2),
+    ("GET", "/users/", {}, 2),
+    ("PUT", "/users/{user_id}", {"json": USER}, 2),
+    ("DELETE", "/users/{user_id}", {}, 3),
+    ("POST", "/todos/", {"json": TODO}, 2),
+    ("GET", "/todos/", {}, 3),
+    ("GET", "/todos/", {"params": {"search": "budget"}}, 3),
+    ("GET", "/todos/stats", {}, 2),
+    ("GET", "/todos/changes", {"params": {"since": 0}}, 1),
+    ("GET", "/todos/export", {}, 2),
+    (
+        "POST",
+        "/todos/import",
+        {"files": {"file": ("todos.ndjson", NDJSON)}},
+        2,
+    ),
+    ("POST", "/todos/bulk", {"json": {"todos": [TODO] * 3}}, 2),
+    (
+        "PATCH",
+        "/todos/bulk",
+        {"json": {"todos": [{"id": "{todo_id}", "state": "done"}]}},
+        4,
+    ),
+    ("DELETE", "/todos/bulk", {"json": {"ids": ["{todo_id}"]}}, 2),
+    ("PUT", "/todos/{todo_id}", {"json": TODO}, 2),
+    ("PATCH", "/todos/{todo_id}", {"json": {"state": "done"}}, 2),
+    ("DELETE", "/todos/{todo_id}", {}, 2),
+]
+
+
+def fill_ids(value, ids: dict):
+    if isinstance(value, dict):
+        return {key: fill_ids(item, ids) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [fill_ids(item, ids) for item in value]
+
+    if value == "{todo_id}":
+        return ids["todo_id"]
+
+    return value
+
+
+def request_within_budget(client, method, url, options, max_statements):
+    credentials = {"username": USER["email"], "password": USER["password"]}
+    user = client.post("/users/", json=USER).json()
+    token = client.post("/auth/token", data=credentials).json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+    todo = client.post("/todos/", json=TODO, headers=headers).json()
+    ids = {"user_id": user["id"], "todo_id": todo["id"]}
+
+    if url == "/auth/token":
+        options = {"data": credentials}
+    elif url == "/users/":
+        options = {"json": {**USER, "username": "other", "email": "o@x.com"}}
+
+    user_cache.clear()
+    claims_cache.clear()
+
+    with query_budget(max_statements):
+        response = client.request(
+            method,
+            url.format(**ids),
+            headers=headers,
+            **fill_ids(options, ids),
+        )
+
+    assert response.is_success, response.text
+
+
+@pytest.mark.parametrize(("method", "url", "options", "budget"), BUDGETS)
+def test_query_budget(client, method, url, options, budget):
+    request_within_budget(client, method, url, options, budget)
+
+
+@pytest.mark.parametrize(("method", "url", "options", "budget"), BUDGETS)
+def test_async_query_budget(async_client, method, url, options, budget):
+    request_within_budget(async_client, method, url, options, budget)
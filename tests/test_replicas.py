@@ -0,0 +1,204 @@
+import json
+from contextlib import ExitStack
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from freezegun import freeze_time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from fast_zero import database
+from fast_zero.app import create_app
+from fast_zero.database import (
+    LAST_WRITE_COOKIE,
+    ReplicaSet,
+    build_engine,
+    get_async_engine,
+    get_async_read_replicas,
+    get_read_replicas,
+    recent_writers,
+)
+from fast_zero.metrics import db_replica_failovers
+from fast_zero.models import User, table_registry
+from fast_zero.security import create_access_token
+from fast_zero.settings import reload_settings
+
+
+def create_database(path, *usernames) -> str:
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add_all(
+            User(
+                username=username,
+                email=f"{username}@example.com",
+                password="secret",
+            )
+            for username in usernames
+        )
+        session.commit()
+
+    engine.dispose()
+    return url
+
+
+def usernames(response) -> list[str]:
+    return [user["username"] for user in response.json()["users"]]
+
+
+def clear_engine_caches():
+    get_async_engine.cache_clear()
+    get_read_replicas.cache_clear()
+    get_async_read_replicas.cache_clear()
+
+
+def dispose_engines(client, async_mode: bool):
+    if async_mode:
+        for engine in (get_async_engine(), *get_async_read_replicas().engines):
+            client.portal.call(engine.dispose)
+    else:
+        for engine in (database.engine, *get_read_replicas().engines):
+            engine.dispose()
+
+    clear_engine_caches()
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+def routed_client(request, tmp_path, monkeypatch):
+    async_mode = request.param
+    primary_url = create_database(tmp_path / "primary.db", "primary")
+
+    with ExitStack() as stack:
+
+        def connect(*replica_urls):
+            monkeypatch.setenv("DATABASE_URL", primary_url)
+            monkeypatch.setenv("DATABASE_READ_URLS", json.dumps(replica_urls))
+            reload_settings()
+            clear_engine_caches()
+            monkeypatch.setattr(database, "engine", build_engine(primary_url))
+
+            client = stack.enter_context(
+                TestClient(create_app(async_mode=async_mode)),
+            )
+            stack.callback(dispose_engines, client, async_mode)
+            return client
+
+        yield connect
+
+
+def test_reads_should_use_replica(routed_client, tmp_path):
+    replica_url = create_database(tmp_path / "replica.db", "replica")
+    client = routed_client(replica_url)
+    token = create_access_token(data={"sub": "replica@example.com"})
+
+    users = client.get("/users/")
+    todos = client.get(
+        "/todos/",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert usernames(users) == ["replica"]
+    assert todos.status_code == HTTPStatus.OK
+
+
+def test_writes_should_use_primary_and_stick(routed_client, tmp_path):
+    replica_url = create_database(tmp_path / "replica.db", "replica")
+    client = routed_client(replica_url)
+
+    response = client.post(
+        "/users/",
+        json={
+            "username": "alice",
+            "email": "alice@example.com",
+            "password": "secret",
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert LAST_WRITE_COOKIE in response.cookies
+    assert usernames(client.get("/users/")) == ["primary", "alice"]
+
+    client.cookies.clear()
+
+    assert usernames(client.get("/users/")) == ["replica"]
+
+
+def test_current_user_should_fall_back_to_primary(routed_client, tmp_path):
+    client = routed_client(create_database(tmp_path / "replica.db"))
+    token = create_access_token(data={"sub": "primary@example.com"})
+
+    response = client.get(
+        "/todos/",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_writes_should_stick_for_bearer_token(routed_client, tmp_path):
+    client = routed_client(create_database(tmp_path / "replica.db", "primary"))
+    token = create_access_token(data={"sub": "primary@example.com"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "draft"},
+        headers=headers,
+    )
+    client.cookies.clear()
+    todos = client.get("/todos/", headers=headers)
+
+    recent_writers.clear()
+    replica_todos = client.get("/todos/", headers=headers)
+
+    assert [todo["title"] for todo in todos.json()["todos"]] == ["a"]
+    assert replica_todos.json()["todos"] == []
+
+
+def test_reads_should_round_robin_replicas(routed_client, tmp_path):
+    client = routed_client(
+        create_database(tmp_path / "first.db", "first"),
+        create_database(tmp_path / "second.db", "second"),
+    )
+
+    served = [usernames(client.get("/users/")) for _ in range(4)]
+
+    assert served == [["first"], ["second"], ["first"], ["second"]]
+
+
+def test_reads_should_fail_over_to_healthy_replica(routed_client, tmp_path):
+    client = routed_client(
+        f"sqlite:///{tmp_path / 'missing' / 'replica.db'}",
+        create_database(tmp_path / "replica.db", "replica"),
+    )
+    failovers = db_replica_failovers.value()
+
+    served = [usernames(client.get("/users/")) for _ in range(3)]
+
+    assert served == [["replica"]] * 3
+    assert db_replica_failovers.value() == failovers + 1
+
+
+def test_reads_should_fall_back_to_primary(routed_client, tmp_path):
+    client = routed_client(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+
+    assert usernames(client.get("/users/")) == ["primary"]
+
+
+def test_replica_set_should_retry_replica_after_timeout():
+    first = create_engine("sqlite://")
+    second = create_engine("sqlite://")
+    replicas = ReplicaSet([first, second], retry_seconds=30)
+
+    with freeze_time("2026-01-01") as frozen:
+        replicas.mark_down(first)
+
+        assert replicas.candidates() == [second]
+        assert replicas.candidates() == [second]
+
+        frozen.tick(30)
+
+        assert set(replicas.candidates()) == {first, second}
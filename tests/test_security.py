@@ -2,15 +2,19 @@ from http import HTTPStatus
 
 import pytest
 from fastapi import HTTPException
+from freezegun import freeze_time
 from jwt import decode
+from jwt.exceptions import ExpiredSignatureError
 
 from fast_zero.security import (
     create_access_token,
+    decode_token,
+    get_claims_cache_stats,
     get_current_user,
     get_password_hash,
     verify_password,
 )
-from fast_zero.settings import Settings
+from fast_zero.settings import Settings, get_settings
 
 
 def test_get_password_hash_should_return_hashed_password():
@@ -50,6 +54,7 @@ def test_get_current_user_decode_error():
         get_current_user(
             session=fake_session,
             token=invalid_token,
+            settings=get_settings(),
         )
     assert exc_info.value.status_code == HTTPStatus.UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
@@ -64,7 +69,9 @@ def test_get_current_user_without_username_in_token():
     with pytest.raises(HTTPException) as exc_info:
         get_current_user(
             session=fake_session,
+            primary_session=fake_session,
             token=token,
+            settings=get_settings(),
         )
     assert exc_info.value.status_code == HTTPStatus.UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
@@ -84,7 +91,50 @@ def test_get_current_user_user_not_found():
     with pytest.raises(HTTPException) as exc_info:
         get_current_user(
             session=fake_session,
+            primary_session=fake_session,
             token=token,
+            settings=get_settings(),
         )
     assert exc_info.value.status_code == HTTPStatus.UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
+
+
+def test_get_current_user_should_use_cached_user(session, user):
+    token = create_access_token({"sub": user.email})
+
+    first = get_current_user(
+        session=session,
+        token=token,
+        settings=get_settings(),
+    )
+    second = get_current_user(
+        session=None,
+        token=token,
+        settings=get_settings(),
+    )
+
+    assert first is second
+    assert second.id == user.id
+    assert second.email == user.email
+
+
+def test_decode_token_should_cache_verified_claims():
+    token = create_access_token({"sub": "test_user"})
+
+    first = decode_token(token)
+    second = decode_token(token)
+
+    assert first is second
+    assert get_claims_cache_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_decode_token_should_reject_cached_token_after_exp():
+    with freeze_time("2025-01-01 12:00:00"):
+        token = create_access_token({"sub": "test_user"})
+        decode_token(token)
+
+    with (
+        freeze_time("2025-01-01 12:31:00"),
+        pytest.raises(ExpiredSignatureError),
+    ):
+        decode_token(token)
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from pydantic import ValidationError
+
+from fast_zero.app import app
+from fast_zero.settings import (
+    get_settings,
+    reload_settings,
+    reload_settings_on_signal,
+)
+
+
+def test_get_settings_should_return_cached_instance():
+    assert get_settings() is get_settings()
+
+
+def test_reload_settings_should_read_environment_again(monkeypatch):
+    expected_minutes = 5
+    settings = get_settings()
+    monkeypatch.setenv("ACCESS_TOKEN_EXPIRE_MINUTES", str(expected_minutes))
+
+    reloaded = reload_settings()
+
+    assert reloaded is not settings
+    assert reloaded.ACCESS_TOKEN_EXPIRE_MINUTES == expected_minutes
+    assert get_settings() is reloaded
+
+
+def test_reload_settings_should_keep_current_settings_on_error(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setenv("ACCESS_TOKEN_EXPIRE_MINUTES", "oops")
+
+    with pytest.raises(ValidationError):
+        reload_settings()
+
+    assert get_settings() is settings
+
+
+def test_reload_settings_on_signal_should_log_errors(monkeypatch, caplog):
+    settings = get_settings()
+    monkeypatch.setenv("ACCESS_TOKEN_EXPIRE_MINUTES", "oops")
+
+    reload_settings_on_signal()
+
+    assert get_settings() is settings
+    assert "reload failed" in caplog.text
+    assert "ACCESS_TOKEN_EXPIRE_MINUTES" in caplog.text
+
+
+def test_settings_should_be_overridable_per_app(client, user, token):
+    settings = get_settings().model_copy(
+        update={"SECRET_KEY": "overridden-secret"},
+    )
+    app.dependency_overrides[get_settings] = lambda: settings
+
+    old_token = client.get(
+        "/todos/",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    new_token = client.post(
+        "/auth/token",
+        data={"username": user.email, "password": user.clean_password},
+    ).json()["access_token"]
+    todos = client.get(
+        "/todos/",
+        headers={"Authorization": f"Bearer {new_token}"},
+    )
+
+    assert old_token.status_code == HTTPStatus.UNAUTHORIZED
+    assert todos.status_code == HTTPStatus.OK
@@ -1,5 +1,19 @@
+import csv
+import io
+import json
 from http import HTTPStatus
 
+import pytest
+from sqlalchemy import func, select
+
+from fast_zero import formats
+from fast_zero.events import broker
+from fast_zero.formats import IMPORT_BATCH_SIZE
+from fast_zero.models import Todo
+from fast_zero.pagination import encode_cursor
+from fast_zero.routers.todos import IMPORT_MAX_ERRORS
+from fast_zero.schemas import MAX_PAGE_LIMIT
+from fast_zero.settings import reload_settings
 from tests.conftest import TodoFactory
 
 
@@ -196,3 +210,811 @@ def test_update_todo_should_return_404(session, client, user, token):
     )
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json()["detail"] == "Task not found."
+
+
+def test_list_todos_should_paginate_with_cursor(session, client, user, token):
+    expected_todos = 5
+    session.bulk_save_objects(
+        TodoFactory.create_batch(expected_todos, user_id=user.id),
+    )
+    session.commit()
+
+    ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get(
+            "/todos/",
+            params=params,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        ids += [todo["id"] for todo in response.json()["todos"]]
+        cursor = response.json()["next_cursor"]
+
+        if not cursor:
+            break
+
+    assert ids == sorted(set(ids))
+    assert len(ids) == expected_todos
+
+
+def test_list_todos_should_return_400_for_invalid_cursor(client, token):
+    response = client.get(
+        "/todos/?cursor=invalid",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_list_todos_should_return_400_for_out_of_range_cursor(
+    client,
+    user,
+    token,
+):
+    response = client.get(
+        "/todos/",
+        params={"cursor": encode_cursor(user.id, 10**30)},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("limit", [0, -2, MAX_PAGE_LIMIT + 1])
+def test_list_todos_should_reject_limit_out_of_range(client, token, limit):
+    response = client.get(
+        "/todos/",
+        params={"limit": limit},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_list_todos_should_return_400_for_cursor_of_other_user(
+    client,
+    user,
+    token,
+):
+    response = client.get(
+        "/todos/",
+        params={"cursor": encode_cursor(user.id + 1, 1)},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_list_todos_search_should_rank_matches(session, client, user, token):
+    session.add_all(
+        [
+            TodoFactory(
+                user_id=user.id,
+                title="groceries",
+                description="buy milk and bread",
+            ),
+            TodoFactory(
+                user_id=user.id,
+                title="milk the cows",
+                description="milk before sunrise, then milk again",
+            ),
+            TodoFactory(user_id=user.id, title="gym", description="leg day"),
+        ]
+    )
+    session.commit()
+
+    response = client.get(
+        "/todos/",
+        params={"search": "milk"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [todo["title"] for todo in response.json()["todos"]] == [
+        "milk the cows",
+        "groceries",
+    ]
+    assert response.json()["next_cursor"] is None
+
+
+def test_list_todos_search_should_match_prefixes_and_accents(
+    session,
+    client,
+    user,
+    token,
+):
+    session.add(
+        TodoFactory(user_id=user.id, title="Reunião", description="café"),
+    )
+    session.commit()
+
+    response = client.get(
+        "/todos/",
+        params={"search": "reuni cafe"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert len(response.json()["todos"]) == 1
+
+
+def test_list_todos_search_should_follow_updates_and_deletes(
+    session,
+    client,
+    user,
+    token,
+):
+    todo = TodoFactory(user_id=user.id, title="draft", description="notes")
+    session.add(todo)
+    session.commit()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.put(
+        f"/todos/{todo.id}",
+        json={"title": "final", "description": "notes", "state": "done"},
+        headers=headers,
+    )
+    drafts = client.get("/todos/", params={"search": "draft"}, headers=headers)
+    finals = client.get("/todos/", params={"search": "final"}, headers=headers)
+
+    assert drafts.json()["todos"] == []
+    assert len(finals.json()["todos"]) == 1
+
+    client.delete(f"/todos/{todo.id}", headers=headers)
+    finals = client.get("/todos/", params={"search": "final"}, headers=headers)
+
+    assert finals.json()["todos"] == []
+
+
+def test_list_todos_search_should_only_return_own_todos(
+    session,
+    client,
+    other_user,
+    token,
+):
+    session.add(TodoFactory(user_id=other_user.id, title="secret"))
+    session.commit()
+
+    response = client.get(
+        "/todos/",
+        params={"search": "secret"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.json()["todos"] == []
+
+
+def test_list_todos_search_should_ignore_query_syntax(client, token):
+    response = client.get(
+        "/todos/",
+        params={"search": 'milk" OR NEAR(*'},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    blank = client.get(
+        "/todos/",
+        params={"search": "***"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert blank.json()["todos"] == []
+
+
+def test_list_todos_search_should_reject_cursor(client, user, token):
+    response = client.get(
+        "/todos/",
+        params={"search": "milk", "cursor": encode_cursor(user.id, 1)},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_create_todos_bulk_should_report_invalid_items(client, token):
+    response = client.post(
+        "/todos/bulk",
+        json={
+            "todos": [
+                {"title": "a", "description": "a", "state": "draft"},
+                {"title": "b", "state": "draft"},
+                {"title": "c", "description": "c", "state": "nope"},
+                {"title": "d", "description": "d", "state": "done"},
+            ]
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [todo["title"] for todo in response.json()["todos"]] == ["a", "d"]
+    assert [error["index"] for error in response.json()["errors"]] == [1, 2]
+    assert "description" in response.json()["errors"][0]["detail"]
+
+
+def test_update_todos_bulk(session, client, user, other_user, token):
+    own = TodoFactory.create_batch(2, user_id=user.id, state="draft")
+    foreign = TodoFactory(user_id=other_user.id, title="foreign")
+    session.add_all([*own, foreign])
+    session.commit()
+
+    response = client.patch(
+        "/todos/bulk",
+        json={
+            "todos": [
+                {"id": own[0].id, "state": "done"},
+                {"id": own[1].id, "title": "renamed"},
+                {"id": foreign.id, "title": "stolen"},
+                {"title": "no id"},
+            ]
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    session.expire_all()
+
+    assert response.status_code == HTTPStatus.OK
+    assert [todo["id"] for todo in response.json()["todos"]] == [
+        own[0].id,
+        own[1].id,
+    ]
+    assert response.json()["errors"] == [
+        {"index": 2, "detail": "Task not found."},
+        {"index": 3, "detail": "id: Field required"},
+    ]
+    assert own[0].state == "done"
+    assert own[1].title == "renamed"
+    assert foreign.title == "foreign"
+
+
+def test_update_todos_bulk_should_skip_items_without_changes(
+    session,
+    client,
+    user,
+    token,
+):
+    todos = TodoFactory.create_batch(3, user_id=user.id, state="draft")
+    session.add_all(todos)
+    session.commit()
+    ids = [todo.id for todo in todos]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.patch(
+        "/todos/bulk",
+        json={
+            "todos": [
+                {"id": ids[0]},
+                {"id": ids[1], "title": None, "state": None},
+                {"id": ids[2], "state": "done"},
+            ]
+        },
+        headers=headers,
+    )
+    revision = broker.revision(user.id)
+    unchanged = client.patch(
+        "/todos/bulk",
+        json={"todos": [{"id": ids[0]}, {"id": ids[1], "title": None}]},
+        headers=headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [todo["id"] for todo in response.json()["todos"]] == [ids[2]]
+    assert unchanged.json() == {"todos": [], "errors": []}
+    assert broker.revision(user.id) == revision
+
+
+def test_delete_todos_bulk(session, client, user, other_user, token):
+    own = TodoFactory.create_batch(3, user_id=user.id)
+    foreign = TodoFactory(user_id=other_user.id)
+    session.add_all([*own, foreign])
+    session.commit()
+    ids = [todo.id for todo in own]
+
+    response = client.request(
+        "DELETE",
+        "/todos/bulk",
+        json={"ids": [*ids, foreign.id]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        "deleted": ids,
+        "errors": [{"index": 3, "detail": "Task not found."}],
+    }
+    assert session.get(Todo, foreign.id) is not None
+
+
+def test_export_todos_as_ndjson(session, client, user, other_user, token):
+    session.add_all(
+        [
+            TodoFactory(user_id=user.id, title="a", state="draft"),
+            TodoFactory(user_id=user.id, title="b", state="done"),
+            TodoFactory(user_id=other_user.id, title="c"),
+        ]
+    )
+    session.commit()
+
+    response = client.get(
+        "/todos/export",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [(row["title"], row["state"]) for row in rows] == [
+        ("a", "draft"),
+        ("b", "done"),
+    ]
+    assert set(rows[0]) == {"id", "title", "description", "state"}
+
+
+def test_export_todos_as_csv(session, client, user, token):
+    expected_rows = 3
+    session.bulk_save_objects(
+        TodoFactory.create_batch(expected_rows, user_id=user.id),
+    )
+    session.add(TodoFactory(user_id=user.id, description='a, "quoted"\nb'))
+    session.commit()
+
+    response = client.get(
+        "/todos/export",
+        params={"format": "csv"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "todos.csv" in response.headers["content-disposition"]
+    assert len(rows) == expected_rows + 1
+    assert rows[-1]["description"] == 'a, "quoted"\nb'
+
+
+def test_import_todos_from_ndjson(session, client, user, token):
+    expected_todos = 2
+    lines = [
+        '{"title": "a", "description": "a", "state": "draft"}',
+        "",
+        "not json",
+        '{"title": "b", "description": "b", "state": "later"}',
+        '{"title": "c", "description": "c", "state": "done"}',
+    ]
+
+    response = client.post(
+        "/todos/import",
+        files={"file": ("todos.ndjson", "\n".join(lines).encode())},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["accepted"] == expected_todos
+    assert [error["index"] for error in response.json()["errors"]] == [1, 2]
+    assert "Invalid JSON" in response.json()["errors"][0]["detail"]
+    assert [
+        todo.title
+        for todo in session.scalars(
+            select(Todo).where(Todo.user_id == user.id).order_by(Todo.id)
+        )
+    ] == ["a", "c"]
+
+
+def test_import_todos_from_csv_in_batches(session, client, user, token):
+    expected_todos = IMPORT_BATCH_SIZE + 10
+    rows = ["\ufefftitle,description,state,extra,"] + [
+        f'todo {n},"line, {n}",todo,x,' for n in range(expected_todos)
+    ]
+    rows.append("broken,row,nope,,")
+
+    response = client.post(
+        "/todos/import",
+        params={"format": "csv"},
+        files={"file": ("todos.csv", "\r\n".join(rows).encode())},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.json() == {
+        "accepted": expected_todos,
+        "rejected": 1,
+        "errors": [
+            {
+                "index": expected_todos,
+                "detail": response.json()["errors"][0]["detail"],
+            }
+        ],
+    }
+    assert session.scalar(select(func.count(Todo.id))) == expected_todos
+
+
+def test_import_todos_should_cap_reported_errors(client, token):
+    rejected = IMPORT_MAX_ERRORS + 5
+
+    response = client.post(
+        "/todos/import",
+        files={"file": ("todos.ndjson", b"{}\n" * rejected)},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.json()["rejected"] == rejected
+    assert len(response.json()["errors"]) == IMPORT_MAX_ERRORS
+
+
+def test_import_todos_should_reject_oversized_csv_field(client, token):
+    rows = [
+        "title,description,state",
+        f"big,{'x' * (csv.field_size_limit() + 1)},todo",
+        "small,a,todo",
+    ]
+
+    response = client.post(
+        "/todos/import",
+        params={"format": "csv"},
+        files={"file": ("todos.csv", "\r\n".join(rows).encode())},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["accepted"] == 1
+    assert response.json()["errors"][0]["index"] == 0
+    assert (
+        "field larger than field limit"
+        in (response.json()["errors"][0]["detail"])
+    )
+
+
+def test_import_todos_should_reject_unreadable_csv_header(
+    session,
+    client,
+    token,
+):
+    response = client.post(
+        "/todos/import",
+        params={"format": "csv"},
+        files={
+            "file": ("todos.csv", b"titl\xe9,description,state\nx,y,draft")
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        "detail": "Invalid CSV header: line is not valid UTF-8",
+    }
+    assert session.scalars(select(Todo.title)).all() == []
+
+
+def test_import_todos_should_reject_csv_header_without_fields(client, token):
+    response = client.post(
+        "/todos/import",
+        params={"format": "csv"},
+        files={"file": ("todos.csv", b"title,body\nx,y")},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        "detail": "Invalid CSV header: missing description, state",
+    }
+
+
+def test_import_todos_should_reject_invalid_utf8(session, client, token):
+    lines = [
+        b'{"title": "caf\xe9", "description": "a", "state": "draft"}',
+        b'{"title": "b", "description": "b", "state": "draft"}',
+    ]
+
+    response = client.post(
+        "/todos/import",
+        files={"file": ("todos.ndjson", b"\n".join(lines))},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.json() == {
+        "accepted": 1,
+        "rejected": 1,
+        "errors": [{"index": 0, "detail": "line is not valid UTF-8"}],
+    }
+    assert session.scalars(select(Todo.title)).all() == ["b"]
+
+
+def test_import_todos_should_reject_long_lines(client, token, monkeypatch):
+    monkeypatch.setattr(formats, "IMPORT_MAX_LINE_BYTES", 100)
+    lines = [
+        json.dumps({"title": "a" * 200, "description": "a", "state": "todo"}),
+        json.dumps({"title": "b", "description": "b", "state": "todo"}),
+    ]
+
+    response = client.post(
+        "/todos/import",
+        files={"file": ("todos.ndjson", "\n".join(lines).encode())},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.json() == {
+        "accepted": 1,
+        "rejected": 1,
+        "errors": [{"index": 0, "detail": "line is longer than 100 bytes"}],
+    }
+
+
+def test_create_todo_should_not_read_back_the_row(client, token, statements):
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/todos/", headers=headers)
+    statements.clear()
+
+    response = client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "draft"},
+        headers=headers,
+    )
+
+    assert response.json()["id"] == 1
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT INTO todos")
+
+
+def test_update_and_delete_todo_should_run_one_statement_each(
+    session,
+    client,
+    user,
+    token,
+    statements,
+):
+    todo = TodoFactory(user_id=user.id)
+    session.add(todo)
+    session.commit()
+    todo_id = todo.id
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/todos/", headers=headers)
+    statements.clear()
+
+    client.put(
+        f"/todos/{todo_id}",
+        json={"title": "a", "description": "a", "state": "done"},
+        headers=headers,
+    )
+    client.delete(f"/todos/{todo_id}", headers=headers)
+
+    assert [statement.split()[0] for statement in statements] == [
+        "UPDATE",
+        "DELETE",
+    ]
+
+
+def test_update_todo_should_not_touch_other_users_todos(
+    session,
+    client,
+    other_user,
+    token,
+):
+    todo = TodoFactory(user_id=other_user.id, title="theirs")
+    session.add(todo)
+    session.commit()
+
+    response = client.put(
+        f"/todos/{todo.id}",
+        json={"title": "mine", "description": "a", "state": "done"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    session.refresh(todo)
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert todo.title == "theirs"
+
+
+def test_patch_todo_should_only_update_sent_fields(
+    session,
+    client,
+    user,
+    token,
+    statements,
+):
+    todo = TodoFactory(user_id=user.id, title="keep", state="draft")
+    session.add(todo)
+    session.commit()
+    todo_id = todo.id
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/todos/", headers=headers)
+    statements.clear()
+
+    response = client.patch(
+        f"/todos/{todo_id}",
+        json={"state": "done"},
+        headers=headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["title"] == "keep"
+    assert response.json()["state"] == "done"
+    assert statements == [
+        "UPDATE todos SET state=? WHERE todos.user_id = ? AND todos.id = ? "
+        "RETURNING id, title, description, state"
+    ]
+
+
+def test_patch_todo_without_changes_should_return_todo(
+    session,
+    client,
+    user,
+    token,
+):
+    todo = TodoFactory(user_id=user.id, title="keep")
+    session.add(todo)
+    session.commit()
+
+    response = client.patch(
+        f"/todos/{todo.id}",
+        json={"title": None},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["title"] == "keep"
+
+
+def test_patch_todo_with_empty_body_should_not_publish(
+    session,
+    client,
+    user,
+    token,
+    statements,
+):
+    todo = TodoFactory(user_id=user.id, title="keep")
+    session.add(todo)
+    session.commit()
+    todo_id = todo.id
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/todos/", headers=headers)
+    revision = broker.revision(user.id)
+    statements.clear()
+
+    response = client.patch(f"/todos/{todo_id}", json={}, headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["title"] == "keep"
+    assert broker.revision(user.id) == revision
+    assert not any(statement.startswith("UPDATE") for statement in statements)
+
+
+def test_patch_todo_should_return_404(client, token):
+    response = client.patch(
+        "/todos/10",
+        json={"state": "done"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {"detail": "Task not found."}
+
+
+def test_read_todo_stats_should_follow_every_write_path(client, token):
+    expected_total = 3
+    headers = {"Authorization": f"Bearer {token}"}
+    todo = client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "draft"},
+        headers=headers,
+    ).json()
+    client.post(
+        "/todos/bulk",
+        json={"todos": [{"title": "b", "description": "b", "state": "done"}]},
+        headers=headers,
+    )
+    client.post(
+        "/todos/import",
+        files={
+            "file": (
+                "todos.ndjson",
+                b'{"title": "c", "description": "c", "state": "done"}\n',
+            )
+        },
+        headers=headers,
+    )
+    client.patch(
+        f"/todos/{todo['id']}", json={"state": "doing"}, headers=headers
+    )
+
+    response = client.get("/todos/stats", headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        "counts": {
+            "draft": 0,
+            "todo": 0,
+            "doing": 1,
+            "done": 2,
+            "trash": 0,
+        },
+        "total": expected_total,
+    }
+
+    client.delete(f"/todos/{todo['id']}", headers=headers)
+    response = client.get("/todos/stats", headers=headers)
+
+    assert response.json()["counts"]["doing"] == 0
+    assert response.json()["total"] == expected_total - 1
+
+
+def test_list_todos_should_return_304_until_todos_change(
+    client,
+    token,
+    statements,
+):
+    headers = {"Authorization": f"Bearer {token}"}
+    first = client.get("/todos/", headers=headers)
+    statements.clear()
+
+    cached = client.get(
+        "/todos/",
+        headers={**headers, "If-None-Match": first.headers["etag"]},
+    )
+
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert cached.headers["etag"] == first.headers["etag"]
+    assert cached.content == b""
+    assert [statement.split()[0] for statement in statements] == ["SELECT"]
+    assert "revisions" in statements[0]
+
+    client.post(
+        "/todos/",
+        json={"title": "a", "description": "a", "state": "draft"},
+        headers=headers,
+    )
+    changed = client.get(
+        "/todos/",
+        headers={**headers, "If-None-Match": first.headers["etag"]},
+    )
+
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert len(changed.json()["todos"]) == 1
+
+
+def test_list_todos_etag_should_depend_on_query_and_user(
+    session,
+    client,
+    token,
+    other_user,
+):
+    headers = {"Authorization": f"Bearer {token}"}
+    all_todos = client.get("/todos/", headers=headers)
+    drafts = client.get("/todos/?state=draft", headers=headers)
+
+    assert all_todos.headers["etag"] != drafts.headers["etag"]
+
+    session.add(TodoFactory(user_id=other_user.id))
+    session.commit()
+    unchanged = client.get(
+        "/todos/",
+        headers={**headers, "If-None-Match": all_todos.headers["etag"]},
+    )
+
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_list_todos_fast_json_should_match_default_response(
+    session,
+    client,
+    user,
+    token,
+    monkeypatch,
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    session.commit()
+    headers = {"Authorization": f"Bearer {token}"}
+    params = {"limit": 2}
+    default = client.get("/todos/", params=params, headers=headers)
+
+    monkeypatch.setenv("FAST_JSON_LISTS", "true")
+    reload_settings()
+    fast = client.get("/todos/", params=params, headers=headers)
+    cached = client.get(
+        "/todos/",
+        params=params,
+        headers={**headers, "If-None-Match": fast.headers["etag"]},
+    )
+
+    assert fast.status_code == HTTPStatus.OK
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == default.json()
+    assert fast.headers["etag"] == default.headers["etag"]
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
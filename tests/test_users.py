@@ -1,6 +1,10 @@
 from http import HTTPStatus
 
-from fast_zero.schemas import UserPublicSchema
+import pytest
+
+from fast_zero.pagination import encode_cursor
+from fast_zero.schemas import MAX_PAGE_LIMIT, UserPublicSchema
+from fast_zero.settings import reload_settings
 
 
 def test_create_user_should_return_user_with_id(client):
@@ -53,7 +57,7 @@ def test_read_users_should_return_list_of_users(client, user):
     response = client.get("/users/")
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {"users": [user_schema]}
+    assert response.json() == {"users": [user_schema], "next_cursor": None}
 
 
 def test_update_user_should_return_updated_user(client, user, token):
@@ -75,6 +79,31 @@ def test_update_user_should_return_updated_user(client, user, token):
     }
 
 
+def test_update_user_should_return_404_if_user_was_deleted(
+    session,
+    client,
+    user,
+    token,
+):
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/auth/refresh_token", headers=headers)
+    session.delete(user)
+    session.commit()
+
+    response = client.put(
+        f"/users/{user.id}",
+        headers=headers,
+        json={
+            "username": "updateduser",
+            "email": "updateduser@example.com",
+            "password": "newpassword",
+        },
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {"detail": "User not found"}
+
+
 def test_update_user_should_return_404_if_user_not_is_current_user(
     client,
     other_user,
@@ -114,3 +143,130 @@ def test_delete_user_should_return_404_if_user_not_is_current_user(
     )
 
     assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_update_user_should_invalidate_cached_user(client, user, token):
+    client.put(
+        f"/users/{user.id}",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "username": "updateduser",
+            "email": "updateduser@example.com",
+            "password": "newpassword",
+        },
+    )
+
+    response = client.get(
+        "/auth/refresh_token",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_delete_user_should_invalidate_cached_user(client, user, token):
+    client.delete(
+        f"/users/{user.id}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    response = client.get(
+        "/auth/refresh_token",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_read_users_should_paginate_with_cursor(client, user, other_user):
+    first_page = client.get("/users/?limit=1")
+    second_page = client.get(
+        "/users/",
+        params={"limit": 1, "cursor": first_page.json()["next_cursor"]},
+    )
+
+    assert [u["id"] for u in first_page.json()["users"]] == [user.id]
+    assert [u["id"] for u in second_page.json()["users"]] == [other_user.id]
+    assert second_page.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize("limit", [0, -2, MAX_PAGE_LIMIT + 1])
+def test_read_users_should_reject_limit_out_of_range(client, limit):
+    response = client.get("/users/", params={"limit": limit})
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_read_users_should_return_400_for_out_of_range_cursor(client):
+    response = client.get("/users/", params={"cursor": encode_cursor(2**63)})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_create_user_should_not_read_back_the_row(client, statements):
+    expected_statements = 2
+
+    client.post(
+        "/users/",
+        json={
+            "username": "testuser",
+            "email": "testuser@example.com",
+            "password": "password",
+        },
+    )
+
+    assert len(statements) == expected_statements
+    assert statements[-1].startswith("INSERT INTO users")
+
+
+def test_read_users_should_return_304_until_users_change(
+    session,
+    client,
+    user,
+):
+    first = client.get("/users/")
+
+    cached = client.get(
+        "/users/",
+        headers={"If-None-Match": f'{first.headers["etag"]}, "other"'},
+    )
+    user.password = "rehashed"
+    session.commit()
+    after_rehash = client.get(
+        "/users/",
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    client.post(
+        "/users/",
+        json={
+            "username": "new",
+            "email": "new@example.com",
+            "password": "password",
+        },
+    )
+    after_signup = client.get(
+        "/users/",
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert after_rehash.status_code == HTTPStatus.NOT_MODIFIED
+    assert after_signup.status_code == HTTPStatus.OK
+
+
+def test_read_users_fast_json_should_match_default_response(
+    client,
+    user,
+    other_user,
+    monkeypatch,
+):
+    default = client.get("/users/", params={"limit": 1})
+
+    monkeypatch.setenv("FAST_JSON_LISTS", "true")
+    reload_settings()
+    fast = client.get("/users/", params={"limit": 1})
+
+    assert fast.json() == default.json()
+    assert fast.json()["next_cursor"] is not None
+    assert fast.headers["etag"] == default.headers["etag"]